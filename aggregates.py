@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from instrument import timed
+
+
+# Two-sided 95% normal quantile for the confidence intervals
+Z_95 = 1.959963984540054
+
+
+class AggregateStore:
+    # Sum and count of values per (year, gender, country, indicator), built
+    # once from the cube. Averages for any country selection are sums over
+    # the selected rows of these small arrays, memoized per selection.
+    #
+    # With population weights (see weights.py) the same partials are kept
+    # weighted: w * value and w per cell, plus w^2 * sampling variance when
+    # sample sizes are known. A regional mean over any country subset is
+    # then sum(w * value) / sum(w) over the selected countries, with
+    # variance sum(w^2 * var) / sum(w)^2 for the confidence interval.
+
+    def __init__(self, cube, weights=None, maxsize=256):
+        self.cube = cube
+        values = np.moveaxis(cube.values, [1, 3, 0, 2], [0, 1, 2, 3])  # (year, gender, country, indicator)
+        present = ~np.isnan(values)
+        self.sums = np.where(present, values, 0).astype(np.float64)
+        self.counts = present.astype(np.int64)
+
+        self.weighted = weights is not None
+        self.weighted_sums = self.weights = self.variances = None
+        self.population = weights.population if weights is not None else None  # (country, year, gender)
+        if weights is not None:
+            population = np.moveaxis(weights.population, [1, 2, 0], [0, 1, 2])[..., None]  # (year, gender, country, 1)
+            self.weights = np.where(present, np.nan_to_num(population), 0.0)
+            self.weighted_sums = self.weights * self.sums
+            if weights.samples is not None:
+                samples = np.moveaxis(weights.samples, [1, 2, 0], [0, 1, 2])[..., None]
+                share = self.sums / 100
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    variance = 100 ** 2 * share * (1 - share) / samples
+                # A cell with a value but no sample size leaves its selection without an interval
+                self.variances = np.where(present, np.where(samples > 0, self.weights ** 2 * variance, np.nan), 0.0)
+        self._summary = lru_cache(maxsize=maxsize)(self._compute)
+
+    @timed('aggregate')
+    def summary(self, year, gender, countries, weighted=True):
+        return self._summary(year, gender, frozenset(countries), weighted and self.weighted)
+
+    def latest_population(self, gender):
+        # Population per country in the latest year, e.g. to weight projections
+        if self.population is None:
+            return None
+        return self.population[:, -1, self.cube.position('Gender', gender)]
+
+    def cache_info(self):
+        return self._summary.cache_info()
+
+    def _compute(self, year, gender, countries, weighted):
+        cube = self.cube
+        year_pos = cube.position('Year', year)
+        gender_pos = cube.position('Gender', gender)
+        country_pos = cube.select(countries=countries)[0]
+
+        sums = self.sums[:, gender_pos][:, country_pos]  # (year, country, indicator)
+        counts = self.counts[:, gender_pos][:, country_pos]
+        # Regional means weight countries by population; a country's own mean
+        # over indicators stays unweighted
+        region_sums = self.weighted_sums[:, gender_pos][:, country_pos] if weighted else sums
+        region_weights = self.weights[:, gender_pos][:, country_pos] if weighted else counts
+
+        # Selected countries with data but no population weight, per year; the
+        # weighted means leave them out there
+        unweighted = {}
+        if weighted:
+            lacking = (counts.sum(axis=2) > 0) & (region_weights.sum(axis=2) == 0)  # (year, country)
+            for y, c in zip(*np.nonzero(lacking)):
+                unweighted.setdefault(cube.countries[country_pos[c]], []).append(cube.years[y])
+
+        intervals = None
+        with np.errstate(invalid='ignore', divide='ignore'):
+            total_weights = region_weights[year_pos].sum(axis=0)
+            indicator_means = region_sums[year_pos].sum(axis=0) / total_weights
+            country_means = sums[year_pos].sum(axis=1) / counts[year_pos].sum(axis=1)
+            trend_means = region_sums.sum(axis=1) / region_weights.sum(axis=1)  # (year, indicator)
+            if weighted and self.variances is not None:
+                # NaN (no interval) as soon as one selected cell lacks a sample size
+                variances = self.variances[year_pos, gender_pos][country_pos].sum(axis=0)
+                intervals = pd.Series(Z_95 * np.sqrt(variances) / total_weights, index=cube.indicators)
+
+        by_country = pd.DataFrame({
+            'Country': [cube.countries[i] for i in country_pos],
+            'Value': country_means,
+        }).dropna()
+
+        trend_years, trend_indicators = np.meshgrid(np.arange(len(cube.years)),
+                                                    np.arange(len(cube.indicators)), indexing='ij')
+        trends = pd.DataFrame({
+            'Year': np.asarray(cube.years)[trend_years.ravel()],
+            'Indicator': pd.Categorical.from_codes(trend_indicators.ravel(), categories=cube.indicators),
+            'Value': trend_means.ravel(),
+        }).dropna()
+
+        return Summary(
+            indicators=pd.Series(indicator_means, index=cube.indicators),
+            countries=by_country.sort_values('Value', ascending=False),
+            trends=trends,
+            weighted=weighted,
+            intervals=intervals,
+            unweighted=unweighted,
+        )
+
+
+class Summary:
+    # intervals: 95% half-widths per indicator, None without sample sizes;
+    # unweighted: country -> years it has data but no population weight
+
+    def __init__(self, indicators, countries, trends, weighted=False, intervals=None, unweighted=None):
+        self.indicators = indicators
+        self.countries = countries
+        self.trends = trends
+        self.weighted = weighted
+        self.intervals = intervals
+        self.unweighted = unweighted or {}
@@ -0,0 +1,338 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import loaders
+from data import BREAKDOWNS
+from lru import LRUCache
+
+# Read-only HTTP API over the same data layer as home.py, for machine
+# clients that would otherwise scrape the UI: the Dashboard's filtered
+# tables and averages, rankings, country summaries, trend and gap series,
+# projections and breakdowns, as JSON records or Arrow IPC streams. Every
+# request pins the current snapshot, and encoded responses are cached per
+# (canonical query, format, data version) with an ETag derived from the
+# same key, so repeat requests cost a dictionary lookup or a 304.
+#
+#     python api.py --port 8600          # standalone, next to the app
+#     DIWA_API_PORT=8600 streamlit run home.py   # inside each app process
+
+# Local only unless DIWA_API_HOST says otherwise, e.g. 0.0.0.0 behind a proxy
+API_HOST = os.environ.get('DIWA_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('DIWA_API_PORT') or 8600)
+
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+# ?format= value -> Content-Type
+FORMATS = {'json': 'application/json', 'arrow': ARROW_TYPE}
+# Decimals kept in float columns; values are stored as float32, so anything
+# finer is representation noise (70.7 -> 70.6999969482)
+DECIMALS = 4
+
+
+class ApiError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache(LRUCache):
+    # Process-wide LRU of encoded response bodies keyed by (canonical query,
+    # format, data version), bounded by their total size
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        super().__init__(max_bytes=max_bytes)
+
+    def cached(self, query, fmt, version, build):
+        # (body, whether it came from the cache)
+        key = (query, fmt, version)
+        body = self.get(key)
+        if body is not None:
+            return body, True
+        body = build()
+        self.put(key, body)
+        return body, False
+
+
+class Query:
+    # Query parameters resolved against the cube's labels. Lists are comma
+    # separated, as in the page URLs. canonical keeps the normalized text of
+    # every parameter read, so equivalent URLs share a cache entry and ETag.
+
+    def __init__(self, params):
+        self.params = params
+        self.canonical = {}
+
+    def _match(self, name, text, options):
+        by_text = {str(option): option for option in options}
+        if text not in by_text:
+            raise ApiError(400, f"unknown {name}: {text}")
+        return by_text[text]
+
+    def many(self, name, options):
+        # Every option when the parameter is absent
+        options = list(options)
+        if name in self.params:
+            chosen = {self._match(name, part.strip(), options)
+                      for part in self.params[name].split(',') if part.strip()}
+            options = [option for option in options if option in chosen]
+        self.canonical[name] = ','.join(str(option) for option in options)
+        return options
+
+    def one(self, name, options, default):
+        value = self._match(name, self.params[name].strip(), options) if name in self.params else default
+        self.canonical[name] = str(value)
+        return value
+
+    def flag(self, name, default):
+        text = self.params.get(name, str(default)).strip().lower()
+        if text not in ('1', 'true', 'yes', '0', 'false', 'no'):
+            raise ApiError(400, f"{name} must be true or false")
+        self.canonical[name] = str(text in ('1', 'true', 'yes')).lower()
+        return text in ('1', 'true', 'yes')
+
+    def number(self, name, default=None):
+        text = self.params.get(name)
+        try:
+            value = default if text is None else int(text)
+        except ValueError:
+            raise ApiError(400, f"{name} must be an integer") from None
+        self.canonical[name] = '' if value is None else str(value)
+        return value
+
+
+# Endpoints read their parameters from a Query and return a function that
+# builds the response: a DataFrame (JSON records or Arrow) or a dict (JSON).
+# They run inside loaders.pinned_snapshot(), so every loaders.get_* call in
+# one request sees the same data version.
+
+def _index(cube, q):
+    return lambda: {
+        'version': cube.version,
+        'countries': cube.countries, 'years': cube.years,
+        'indicators': cube.indicators, 'genders': cube.genders,
+        'breakdowns': BREAKDOWNS,
+        'endpoints': {path: doc for path, (_, doc) in ENDPOINTS.items()},
+    }
+
+
+def _data(cube, q):
+    countries, years = q.many('countries', cube.countries), q.many('years', cube.years)
+    indicators, genders = q.many('indicators', cube.indicators), q.many('genders', cube.genders)
+    return lambda: cube.frame(countries=countries, years=years, indicators=indicators, genders=genders)
+
+
+def _summary(cube, q, by_year=True):
+    # Trends span every year, so they ignore ?year=
+    year = q.one('year', cube.years, cube.years[-1]) if by_year else cube.years[-1]
+    gender = q.one('gender', cube.genders, 'all')
+    countries = q.many('countries', cube.countries)
+    weighted = q.flag('weighted', True)
+    return lambda: loaders.get_aggregates().summary(year, gender, countries, weighted=weighted)
+
+
+def _averages(cube, q):
+    summary = _summary(cube, q)
+    by = q.one('by', ['indicator', 'country'], 'indicator')
+
+    def build():
+        result = summary()
+        if by == 'country':
+            return result.countries
+        frame = result.indicators.rename('Value').rename_axis('Indicator').reset_index()
+        frame['CI95'] = result.intervals.to_numpy() if result.intervals is not None else float('nan')
+        frame['Weighted'] = result.weighted
+        return frame
+    return build
+
+
+def _trends(cube, q):
+    summary = _summary(cube, q, by_year=False)
+    return lambda: summary().trends
+
+
+def _rankings(cube, q):
+    column = q.one('column', ['Average', 'Gender Gap'], 'Average')
+    ascending = q.flag('ascending', False)
+    n = q.number('n')
+    return lambda: loaders.get_summaries().leaderboard(column, n=n, ascending=ascending).reset_index()
+
+
+def _countries(cube, q):
+    countries = q.many('countries', cube.countries)
+
+    def build():
+        frame = loaders.get_summaries().frame
+        return frame[frame.index.isin(countries)].reset_index()
+    return build
+
+
+def _profile(cube, q):
+    if 'country' not in q.params:
+        raise ApiError(400, "country is required")
+    country = q.one('country', cube.countries, None)
+
+    def build():
+        summaries = loaders.get_summaries()
+        frame = summaries.indicators(country).rename_axis('Indicator').reset_index()
+        frame.insert(0, 'Country', country)
+        frame.insert(1, 'Year', summaries.row(country)['Year'] if country in summaries.frame.index else None)
+        return frame
+    return build
+
+
+def _gaps(cube, q):
+    countries, indicators = q.many('countries', cube.countries), q.many('indicators', cube.indicators)
+    return lambda: loaders.get_gap_analytics().table(countries=countries, indicators=indicators)
+
+
+def _projections(cube, q):
+    countries, indicators = q.many('countries', cube.countries), q.many('indicators', cube.indicators)
+    genders = q.many('genders', cube.genders)
+    forecasts = loaders.get_forecasts()
+    if forecasts is None:
+        raise ApiError(503, "projections for this data version are still being fitted")
+    return lambda: forecasts.frame(countries=countries, indicators=indicators, genders=genders)
+
+
+def _breakdown(cube, q):
+    by = q.one('by', BREAKDOWNS, BREAKDOWNS[0])
+    filters = {'Country': q.many('countries', cube.countries), 'Year': q.many('years', cube.years),
+               'Indicator': q.many('indicators', cube.indicators), 'Gender': q.many('genders', cube.genders)}
+    if 'provinces' in q.params:
+        filters['Province'] = sorted(part.strip() for part in q.params['provinces'].split(',') if part.strip())
+        q.canonical['provinces'] = ','.join(filters['Province'])
+    engine = loaders.get_query_engine()
+    if engine is None:
+        raise ApiError(404, "no breakdown data")
+    return lambda: engine.query(filters, ['Country', by])
+
+
+# Path -> (endpoint, parameters), listed by /api
+ENDPOINTS = {
+    '/api': (_index, "version, axis labels and this list"),
+    '/api/data': (_data, "countries, years, indicators, genders"),
+    '/api/averages': (_averages, "year, gender, countries, weighted, by=indicator|country"),
+    '/api/trends': (_trends, "gender, countries, weighted"),
+    '/api/rankings': (_rankings, "column=Average|Gender Gap, n, ascending"),
+    '/api/countries': (_countries, "countries"),
+    '/api/profile': (_profile, "country (required)"),
+    '/api/gaps': (_gaps, "countries, indicators"),
+    '/api/projections': (_projections, "countries, indicators, genders"),
+    '/api/breakdown': (_breakdown, "by, countries, years, indicators, genders, provinces"),
+}
+
+
+def encode(result, fmt):
+    if isinstance(result, dict):
+        if fmt != 'json':
+            raise ApiError(406, "only available as JSON")
+        return json.dumps(result).encode()
+    frame = result.reset_index(drop=True)
+    floats = frame.select_dtypes('floating').columns
+    frame[floats] = frame[floats].astype('float64').round(DECIMALS)
+    if fmt == 'arrow':
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return frame.to_json(orient='records').encode()
+
+
+def _format(params, accept):
+    # ?format= wins over the Accept header; JSON by default
+    fmt = params.pop('format', None) or ('arrow' if ARROW_TYPE in accept else 'json')
+    if fmt not in FORMATS:
+        raise ApiError(400, f"format must be one of {', '.join(FORMATS)}")
+    if fmt == 'arrow' and not importlib.util.find_spec('pyarrow'):
+        raise ApiError(406, "Arrow output needs pyarrow")
+    return fmt
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self._respond(body=True)
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def _respond(self, body):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/') or '/'
+        try:
+            if path not in ENDPOINTS:
+                raise ApiError(404, f"no endpoint {path}; see /api")
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            fmt = _format(params, self.headers.get('Accept', ''))
+            with loaders.pinned_snapshot() as snapshot:
+                q = Query(params)
+                build = ENDPOINTS[path][0](snapshot.cube, q)
+                query = f'{path}?{urlencode(sorted(q.canonical.items()))}'
+                etag = '"' + hashlib.blake2b(f'{snapshot.version} {fmt} {query}'.encode(), digest_size=12).hexdigest() + '"'
+                headers = {'ETag': etag, 'X-Data-Version': snapshot.version,
+                           'Cache-Control': 'no-cache', 'Vary': 'Accept'}
+                if self._not_modified(etag):
+                    return self._send(304, headers)
+                payload, hit = self.server.cache.cached(query, fmt, snapshot.version,
+                                                        lambda: encode(build(), fmt))
+        except ApiError as exc:
+            payload = json.dumps({'error': str(exc)}).encode()
+            headers = {'Retry-After': '1'} if exc.status == 503 else {}
+            return self._send(exc.status, {**headers, 'Content-Type': FORMATS['json']}, payload, body)
+
+        headers.update({'Content-Type': FORMATS[fmt], 'X-Cache': 'hit' if hit else 'miss'})
+        self._send(200, headers, payload, body)
+
+    def _not_modified(self, etag):
+        tags = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        return etag in tags or '*' in tags
+
+    def _send(self, status, headers, payload=b'', body=True):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if body and status != 304:
+            self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_api(port=API_PORT, host=API_HOST):
+    # Serve the API on a daemon thread; entries for a replaced data version
+    # are dropped as soon as the store swaps it out
+    server = ThreadingHTTPServer((host, port), _ApiHandler)
+    server.cache = ResponseCache(max_bytes=int(os.environ.get('DIWA_API_CACHE_MB', 64)) * 1024 * 1024)
+    loaders.get_store().subscribe(lambda old, new: server.cache.purge(old))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless JSON/Arrow API over the dashboard data")
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    server = serve_api(args.port, args.host)
+    print(f"Serving on http://{args.host}:{args.port}/api")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+"""Load test: concurrent dashboard sessions replaying recorded interaction scripts.
+
+    python bench/load.py --workers 2 --sessions 8 --duration 30
+    python bench/load.py --scripts my_sessions.json --output load.json --max-p95-ms 500
+
+Starts --workers `streamlit run home.py` servers on local ports, as they
+would run behind the load balancer, and opens --sessions websocket
+sessions spread over them, speaking the browser's protocol. A session
+replays scripts from bench/sessions.json (name -> list of steps: ["page",
+path] or a bench/pages.py widget action) in a loop until --duration runs
+out, starting over as a new visitor for every script. Every step is one
+rerun, timed from the request to the server's script_finished; the report
+gives throughput, p50/p95/p99 rerun latency and each worker's resident
+memory.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.util import calc_md5
+
+from pages import ROOT, SIZES
+
+SCRIPTS = Path(__file__).resolve().parent / 'sessions.json'
+QUANTILES = [0.5, 0.95, 0.99]
+
+# Widget kinds the scripts can drive, as named in the Element proto
+WIDGETS = ['selectbox', 'multiselect', 'radio', 'button']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_bytes(pid):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return None
+
+
+def start_worker(port, env):
+    command = [sys.executable, '-m', 'streamlit', 'run', 'home.py', '--server.port', str(port),
+               '--server.headless', 'true', '--server.fileWatcherType', 'none',
+               '--browser.gatherUsageStats', 'false']
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def wait_healthy(proc, port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f'worker on port {port} exited:\n{proc.stderr.read().decode()}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    sys.exit(f'worker on port {port} not healthy after {timeout}s')
+
+
+class Session:
+    # One browser tab: widget states are kept client-side and sent whole
+    # with every rerun request, as the frontend does
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.pages = {}  # title -> page_script_hash
+        self.page_hash = ''
+        self.widgets = {}  # label -> (kind, element, fragment_id)
+        self.states = {}  # widget id -> WidgetState
+
+    @classmethod
+    async def open(cls, port):
+        return cls(await websocket_connect(f'ws://127.0.0.1:{port}/_stcore/stream', subprotocols=['streamlit']))
+
+    def close(self):
+        self.connection.close()
+
+    async def rerun(self, trigger=None, fragment_id=''):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_script_hash = self.page_hash
+        state.fragment_id = fragment_id
+        state.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            state.widget_states.widgets.append(trigger)
+        if not fragment_id:
+            self.widgets = {}
+        await self.connection.write_message(msg.SerializeToString(), binary=True)
+
+        exceptions = []
+        while True:
+            data = await self.connection.read_message()
+            if data is None:
+                raise RuntimeError('server closed the session')
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+            if kind == 'navigation':
+                self.pages = {page.page_name: page.page_script_hash for page in forward.navigation.app_pages}
+                self.page_hash = forward.navigation.page_script_hash
+            elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                widget = element.WhichOneof('type')
+                if widget in WIDGETS:
+                    proto = getattr(element, widget)
+                    self.widgets[proto.label] = (widget, proto, forward.delta.fragment_id)
+                elif widget == 'exception':
+                    exceptions.append(element.exception.message)
+            elif kind == 'script_finished':
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError('script compile error')
+                if exceptions:
+                    raise RuntimeError(exceptions[0])
+                return
+
+    async def step(self, step):
+        if step[0] == 'page':
+            # st.Page hashes its url path, the file stem, even for the
+            # default page whose url path is sent as ''
+            page_hash = calc_md5(Path(step[1]).stem)
+            if page_hash not in self.pages.values():
+                raise KeyError(f'no page {step[1]!r}')
+            self.page_hash = page_hash
+            self.states = {}
+            return await self.rerun()
+
+        kind, label, value = step
+        # Button labels may carry an icon or flag, e.g. "🇱🇦 Laos"
+        matches = [w for name, w in self.widgets.items() if w[0] == kind and (name == label or name.endswith(label))]
+        if not matches:
+            raise KeyError(f'no {kind} {label!r}')
+        _, proto, fragment_id = matches[0]
+        state = WidgetState(id=proto.id)
+        if kind == 'button':
+            state.trigger_value = True
+            return await self.rerun(trigger=state, fragment_id=fragment_id)
+        options = list(proto.options)
+        if kind == 'selectbox':
+            state.string_value = _option(options, value)
+        elif kind == 'radio':
+            state.int_value = options.index(_option(options, value))
+        else:
+            chosen = options if value == 'ALL' else [_option(options, v) for v in value]
+            state.string_array_value.data.extend(chosen)
+        self.states[proto.id] = state
+        await self.rerun(fragment_id=fragment_id)
+
+
+def _option(options, value):
+    # Options arrive formatted, e.g. 2020 -> "2020"
+    if str(value) not in options:
+        raise ValueError(f'{value!r} not among {options[:5]}...')
+    return str(value)
+
+
+async def run_session(index, port, scripts, deadline, think_ms, results):
+    rng = random.Random(index)
+    names = sorted(scripts)
+    while time.perf_counter() < deadline:
+        session = await Session.open(port)
+        try:
+            start = time.perf_counter()
+            await session.rerun()
+            results['session_starts'].append((time.perf_counter() - start) * 1000)
+            for step in scripts[names[rng.randrange(len(names))]]:
+                if time.perf_counter() >= deadline:
+                    return
+                if think_ms:
+                    await asyncio.sleep(rng.uniform(0, think_ms) / 1000)
+                start = time.perf_counter()
+                try:
+                    await session.step(step)
+                except Exception as exc:
+                    results['errors'].append(f'{step[0]} {step[1]!r}: {exc}')
+                    break
+                results['latencies'].append((time.perf_counter() - start) * 1000)
+                results['per_port'][port] += 1
+        finally:
+            session.close()
+
+
+async def drive(ports, sessions, duration, think_ms, scripts, procs):
+    results = {'latencies': [], 'errors': [], 'session_starts': [], 'per_port': {port: 0 for port in ports}}
+    rss = {proc.pid: [] for proc in procs}
+
+    async def sample_rss():
+        while True:
+            for pid, samples in rss.items():
+                value = rss_bytes(pid)
+                if value is not None:
+                    samples.append(value)
+            await asyncio.sleep(0.25)
+
+    sampler = asyncio.create_task(sample_rss())
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(i, ports[i % len(ports)], scripts, start + duration, think_ms, results)
+                           for i in range(sessions)))
+    results['elapsed'] = time.perf_counter() - start
+    sampler.cancel()
+    results['rss'] = rss
+    return results
+
+
+def quantile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else float('nan')
+
+
+def run_all(workers, sessions, duration, think_ms, scripts, size):
+    env = dict(os.environ)
+    env.pop('DIWA_SYNTHETIC_SCALE', None)
+    if SIZES[size]:
+        env['DIWA_SYNTHETIC_SCALE'] = SIZES[size]
+    ports = [free_port() for _ in range(workers)]
+    procs = [start_worker(port, env) for port in ports]
+    try:
+        for proc, port in zip(procs, ports):
+            wait_healthy(proc, port)
+        rss_start = [rss_bytes(proc.pid) for proc in procs]
+        results = asyncio.run(drive(ports, sessions, duration, think_ms, scripts, procs))
+        rss_end = [rss_bytes(proc.pid) for proc in procs]
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait(timeout=30)
+
+    def mb(value):
+        return value / 2 ** 20 if value is not None else None
+
+    latencies = sorted(results['latencies'])
+    elapsed = results['elapsed']
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'commit': subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                     capture_output=True, text=True).stdout.strip(),
+            'workers': workers, 'sessions': sessions, 'duration_s': duration,
+            'think_ms': think_ms, 'size': size, 'elapsed_s': elapsed,
+        },
+        'reruns': len(latencies),
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'latency_ms': {str(q): quantile(latencies, q) for q in QUANTILES},
+        'session_start_ms': {str(q): quantile(sorted(results['session_starts']), q) for q in QUANTILES},
+        'errors': results['errors'],
+        'workers': [{'port': port, 'rss_start_mb': mb(start), 'rss_end_mb': mb(end),
+                     'rss_peak_mb': mb(max(results['rss'][proc.pid], default=end)),
+                     'reruns': results['per_port'][port]}
+                    for proc, port, start, end in zip(procs, ports, rss_start, rss_end)],
+    }
+
+
+def _mb(value):
+    return f'{value:>7.1f} MB' if value is not None else '      n/a'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2, help="streamlit server processes")
+    parser.add_argument('--sessions', type=int, default=8, help="concurrent sessions, spread over the workers")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds of load")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="random pause of up to this before each step")
+    parser.add_argument('--scripts', type=Path, default=SCRIPTS, help="JSON interaction scripts")
+    parser.add_argument('--size', choices=list(SIZES), default='sample', help="dataset size (see bench/pages.py)")
+    parser.add_argument('--output', type=Path, help="write the JSON report here")
+    parser.add_argument('--max-p95-ms', type=float, help="exit 1 when the p95 rerun is slower than this")
+    args = parser.parse_args()
+
+    scripts = json.loads(args.scripts.read_text())
+    report = run_all(args.workers, args.sessions, args.duration, args.think_ms, scripts, args.size)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    meta = report['meta']
+    print(f"{meta['workers']} workers, {meta['sessions']} sessions, {meta['duration_s']:.0f}s, size {meta['size']}")
+    print(f"throughput      {report['throughput_rps']:>9.1f} reruns/s ({report['reruns']} reruns)")
+    print('rerun latency   ' + '   '.join(f"p{float(q) * 100:g} {ms:>8.1f} ms" for q, ms in report['latency_ms'].items()))
+    print('session start   ' + '   '.join(f"p{float(q) * 100:g} {ms:>8.1f} ms"
+                                          for q, ms in report['session_start_ms'].items()))
+    for i, worker in enumerate(report['workers']):
+        print(f"worker {i}        RSS start {_mb(worker['rss_start_mb'])}   peak {_mb(worker['rss_peak_mb'])}"
+              f"   end {_mb(worker['rss_end_mb'])}   {worker['reruns']} reruns")
+    for error in report['errors'][:10]:
+        print(f"ERROR {error}")
+
+    if report['errors'] or (args.max_p95_ms and report['latency_ms']['0.95'] > args.max_p95_ms):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
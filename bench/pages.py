@@ -0,0 +1,200 @@
+"""Rerun benchmarks for every page, driven through AppTest.
+
+    python bench/pages.py --output bench/baseline.json           # record a baseline
+    python bench/pages.py --baseline bench/baseline.json         # compare, exit 1 on regression
+
+Each dataset size runs in a fresh interpreter with DIWA_SYNTHETIC_SCALE set,
+so process-wide caches start cold for every size.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Name -> COUNTRIESxYEARSxINDICATORS (None: the default sample data)
+SIZES = {
+    'sample': None,
+    'medium': '50x20x20',
+    'large': '200x40x60',
+}
+
+# Name -> (page, widget actions applied before timing). Actions only use the
+# twelve real countries and six real indicators, which every size contains.
+SCENARIOS = {
+    'dashboard/default': ('views/dashboard.py', []),
+    'dashboard/female_2020': ('views/dashboard.py', [
+        ('selectbox', 'Select Year:', 2020),
+        ('selectbox', 'View by Gender:', 'female'),
+    ]),
+    'dashboard/all_countries': ('views/dashboard.py', [
+        ('multiselect', 'Select Countries:', 'ALL'),
+    ]),
+    'asean_map/default': ('views/asean_map.py', []),
+    'asean_map/literacy_female': ('views/asean_map.py', [
+        ('selectbox', 'Select Indicator for Map:', 'Digital Literacy (%)'),
+        ('selectbox', 'View by Gender:', 'female'),
+    ]),
+    'country_profiles/default': ('views/country_profiles.py', []),
+    'country_profiles/laos': ('views/country_profiles.py', [
+        ('button', 'Laos', None),
+    ]),
+    'comparison/bar': ('views/comparison.py', []),
+    'comparison/line': ('views/comparison.py', [
+        ('selectbox', 'Chart Type:', 'Line Chart'),
+    ]),
+    'comparison/radar': ('views/comparison.py', [
+        ('selectbox', 'Chart Type:', 'Radar Chart'),
+    ]),
+    'comparison/radar_all': ('views/comparison.py', [
+        ('multiselect', 'Select Countries to Compare:', 'ALL'),
+        ('selectbox', 'Chart Type:', 'Radar Chart'),
+    ]),
+    'comparison/radar_top_n': ('views/comparison.py', [
+        ('multiselect', 'Select Countries to Compare:', 'ALL'),
+        ('selectbox', 'Chart Type:', 'Radar Chart'),
+        ('radio', 'Radar Mode:', 'Top N + ASEAN average'),
+    ]),
+    'gender_gaps/default': ('views/gender_gaps.py', []),
+    'projections/default': ('views/projections.py', []),
+    'about/default': ('views/about.py', []),
+}
+
+
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def apply_action(at, kind, label, value):
+    if kind == 'selectbox':
+        _widget(at.selectbox, label).select(value)
+    elif kind == 'multiselect':
+        widget = _widget(at.multiselect, label)
+        widget.set_value(widget.options if value == 'ALL' else value)
+    elif kind == 'radio':
+        _widget(at.radio, label).set_value(value)
+    elif kind == 'button':
+        next(b for b in at.button if label in b.label).click()
+    at.run()
+    if at.exception:
+        raise RuntimeError(f'{kind} {label!r}: {at.exception[0].message}')
+
+
+def run_size(runs):
+    # Runs inside the child interpreter; DIWA_SYNTHETIC_SCALE is already set
+    warnings.filterwarnings('ignore')
+    # streamlit run puts the script's folder on sys.path; AppTest does not
+    sys.path.insert(0, str(ROOT))
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / 'home.py'), default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    results = {'cold_start': {'first_ms': (time.perf_counter() - start) * 1000}}
+
+    for name, (page, actions) in SCENARIOS.items():
+        # first_ms: the rerun caused by the last interaction (page switch or widget)
+        at = AppTest.from_file(str(ROOT / 'home.py'), default_timeout=300).run()
+        start = time.perf_counter()
+        at.switch_page(page).run()
+        first = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(f'{name}: {at.exception[0].message}')
+        for action in actions:
+            start = time.perf_counter()
+            apply_action(at, *action)
+            first = (time.perf_counter() - start) * 1000
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            at.run()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'first_ms': first,
+            'median_ms': statistics.median(timings),
+            'min_ms': min(timings),
+        }
+    return results
+
+
+def run_all(sizes, runs):
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'commit': subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                     capture_output=True, text=True).stdout.strip(),
+            'runs': runs,
+        },
+        'results': {},
+    }
+    for size in sizes:
+        env = dict(os.environ)
+        env.pop('DIWA_SYNTHETIC_SCALE', None)
+        if SIZES[size]:
+            env['DIWA_SYNTHETIC_SCALE'] = SIZES[size]
+        out = subprocess.run([sys.executable, __file__, '--child', '--runs', str(runs)],
+                             cwd=ROOT, env=env, capture_output=True, text=True)
+        if out.returncode:
+            sys.exit(f'size {size} failed:\n{out.stderr}')
+        for name, timing in json.loads(out.stdout.strip().splitlines()[-1]).items():
+            report['results'][f'{size}/{name}'] = timing
+    return report
+
+
+def compare(report, baseline, threshold, floor_ms):
+    # A scenario regresses when its median rerun is both `threshold` slower
+    # (relative) and `floor_ms` slower (absolute) than the baseline
+    regressions = []
+    for key, timing in report['results'].items():
+        base = baseline['results'].get(key)
+        metric = 'median_ms' if 'median_ms' in timing else 'first_ms'
+        if not base or metric not in base:
+            continue
+        delta = timing[metric] - base[metric]
+        if delta > floor_ms and delta > base[metric] * threshold:
+            regressions.append((key, base[metric], timing[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--runs', type=int, default=5, help="timed reruns per scenario")
+    parser.add_argument('--output', type=Path, help="write the JSON report here")
+    parser.add_argument('--baseline', type=Path, help="JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument('--floor-ms', type=float, default=5.0, help="ignore slowdowns smaller than this")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_size(args.runs)))
+        return
+
+    report = run_all(args.sizes, args.runs)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    for key, timing in report['results'].items():
+        median = f"{timing['median_ms']:>9.1f}" if 'median_ms' in timing else ' ' * 9
+        print(f"{key:<40} first {timing['first_ms']:>9.1f} ms   median {median} ms")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold, args.floor_ms)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before:.1f} ms -> {after:.1f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
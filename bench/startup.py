@@ -0,0 +1,100 @@
+"""Cold start and rerun timings for home.py, optionally against another git ref.
+
+    python bench/startup.py                    # working tree only
+    python bench/startup.py --ref 741bedd      # before/after table
+
+Each tree is measured in a fresh interpreter so module imports and data
+loading count towards the cold start.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import warnings
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Page name -> (multipage file, value of session_state.current_page in the monolithic app)
+PAGES = {
+    'Dashboard': ('views/dashboard.py', 'Dashboard'),
+    'About': ('views/about.py', 'About'),
+}
+
+
+def _open_page(at, tree, page):
+    path, legacy_name = PAGES[page]
+    if (tree / path).exists():
+        at.switch_page(path)
+    else:
+        at.session_state.current_page = legacy_name
+
+
+def measure(tree, runs):
+    warnings.filterwarnings('ignore')
+    # streamlit run puts the script's folder on sys.path; AppTest does not
+    sys.path.insert(0, str(tree))
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_time = time.perf_counter() - start
+
+    at = AppTest.from_file(str(tree / 'home.py'), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - start
+
+    result = {'import_s': import_time, 'cold_start_s': import_time + first_run}
+    for page in PAGES:
+        _open_page(at, tree, page)
+        at.run()
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+        result[f'{page.lower()}_rerun_s'] = statistics.median(timings)
+    return result
+
+
+def measure_in_subprocess(tree, runs):
+    out = subprocess.run([sys.executable, __file__, '--measure', str(tree), '--runs', str(runs)],
+                         cwd=tree, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def export_ref(ref, target):
+    archive = subprocess.run(['git', 'archive', ref], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target, filter='data')
+    return Path(target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ref', help="git ref to compare the working tree against")
+    parser.add_argument('--runs', type=int, default=5, help="reruns per page")
+    parser.add_argument('--measure', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.runs)))
+        return
+
+    results = {'working tree': measure_in_subprocess(ROOT, args.runs)}
+    if args.ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            results[args.ref] = measure_in_subprocess(export_ref(args.ref, tmp), args.runs)
+
+    names = list(results)
+    print(f"{'metric':<22}" + ''.join(f'{name:>16}' for name in names))
+    for metric in results['working tree']:
+        print(f'{metric:<22}' + ''.join(f'{results[name][metric] * 1000:>14.1f}ms' for name in names))
+
+
+if __name__ == '__main__':
+    main()
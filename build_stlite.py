@@ -0,0 +1,201 @@
+"""Generate index.html, the stlite (Pyodide) browser build, from the app sources.
+
+    python build_stlite.py                 # write index.html
+    python build_stlite.py --check         # build, then enforce the startup budget
+    python build_stlite.py --check --browser   # also time a real headless Chromium load
+
+--browser needs the dev dependencies (uv sync) and a Chromium from
+`playwright install chromium`. CI runs the full check on every push, see
+.github/workflows/stlite.yml.
+
+The bundle ships home.py, the page scripts it registers and the local
+modules they import at top level, plus snapshot.json: the data cube
+precomputed here so the browser never generates or ingests data, and the
+population weights file.
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+ENTRYPOINT = 'home.py'
+STLITE_VERSION = '0.83.0'
+# Population weights for the Dashboard averages, read at the same relative path
+WEIGHTS_FILE = 'data/weights.csv'
+
+# Budgets checked by --check
+MAX_BUNDLE_BYTES = 256 * 1024
+MAX_COLD_START_MS = 3000
+MAX_BROWSER_START_MS = 60000
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="UTF-8" />
+    <meta http-equiv="X-UA-Compatible" content="IE=edge" />
+    <meta
+      name="viewport"
+      content="width=device-width, initial-scale=1, shrink-to-fit=no"
+    />
+    <title>ASEAN-DIWA Dashboard</title>
+    <link
+      rel="stylesheet"
+      href="https://cdn.jsdelivr.net/npm/@stlite/browser@{version}/build/stlite.css"
+    />
+  </head>
+  <body>
+    <!-- Generated by build_stlite.py from {entrypoint}; do not edit by hand. -->
+    <div id="root"></div>
+    <script type="module">
+      import {{ mount }} from "https://cdn.jsdelivr.net/npm/@stlite/browser@{version}/build/stlite.js";
+      mount({{
+        requirements: {requirements},
+        entrypoint: "{entrypoint}",
+        files: {{
+{files}
+        }}
+      }});
+    </script>
+  </body>
+</html>
+"""
+
+
+# Import name -> distribution name, where they differ
+DISTRIBUTIONS = {'PIL': 'Pillow'}
+
+
+def page_files(entrypoint):
+    # Page scripts registered with st.Page("...") in the entrypoint
+    return re.findall(r'st\.Page\(\s*"([^"]+\.py)"', (ROOT / entrypoint).read_text())
+
+
+def top_level_imports(path):
+    tree = ast.parse(path.read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            yield from (alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            yield node.module.split('.')[0]
+
+
+def collect_sources(entrypoint=ENTRYPOINT):
+    # Walk top-level imports from the entrypoint and its pages. Imports nested
+    # in functions (e.g. ingest in loaders.get_store) are server-only paths.
+    pending = [entrypoint, *page_files(entrypoint)]
+    files, packages = {}, set()
+    while pending:
+        name = pending.pop()
+        if name in files:
+            continue
+        files[name] = (ROOT / name).read_text()
+        for module in top_level_imports(ROOT / name):
+            if (ROOT / f'{module}.py').exists():
+                pending.append(f'{module}.py')
+            elif module not in sys.stdlib_module_names and module != 'streamlit':
+                packages.add(DISTRIBUTIONS.get(module, module))
+    return dict(sorted(files.items())), sorted(packages)
+
+
+def build_snapshot():
+    sys.path.insert(0, str(ROOT))
+    from cube import DataCube
+    from data import SAMPLE_SEED, generate_data
+
+    return json.dumps(DataCube.from_frame(generate_data(seed=SAMPLE_SEED)).to_dict(), separators=(',', ':'))
+
+
+def render(files, packages):
+    # JSON string literals are valid JS and need no template-literal escaping
+    entries = ',\n'.join(f'          {json.dumps(name)}: {json.dumps(content, ensure_ascii=False)}'
+                         for name, content in files.items())
+    return TEMPLATE.format(version=STLITE_VERSION, entrypoint=ENTRYPOINT,
+                           requirements=json.dumps(packages), files=entries)
+
+
+def build(output=ROOT / 'index.html'):
+    files, packages = collect_sources()
+    files['snapshot.json'] = build_snapshot()
+    if (ROOT / WEIGHTS_FILE).exists():
+        files[WEIGHTS_FILE] = (ROOT / WEIGHTS_FILE).read_text()
+    output.write_text(render(files, packages))
+    return files
+
+
+def cold_start_ms(files):
+    # Run the bundled files, snapshot included, in a fresh interpreter
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, content in files.items():
+            (Path(tmp) / name).parent.mkdir(parents=True, exist_ok=True)
+            (Path(tmp) / name).write_text(content)
+        script = (
+            "import sys, time, warnings; warnings.filterwarnings('ignore'); t = time.perf_counter()\n"
+            f"sys.path.insert(0, {tmp!r})\n"
+            "from streamlit.testing.v1 import AppTest\n"
+            f"at = AppTest.from_file({str(Path(tmp) / ENTRYPOINT)!r}, default_timeout=120).run()\n"
+            "assert not at.exception, at.exception\n"
+            "print((time.perf_counter() - t) * 1000)\n"
+        )
+        out = subprocess.run([sys.executable, '-c', script], cwd=tmp,
+                             capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def browser_start_ms(html_path, timeout_ms):
+    from playwright.sync_api import sync_playwright
+
+    handler = partial(SimpleHTTPRequestHandler, directory=str(html_path.parent))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page()
+            start = time.perf_counter()
+            page.goto(f'http://127.0.0.1:{server.server_port}/{html_path.name}')
+            page.get_by_text('ASEAN Digital Inclusion for Women Alliance').wait_for(timeout=timeout_ms)
+            elapsed = (time.perf_counter() - start) * 1000
+            browser.close()
+    finally:
+        server.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', type=Path, default=ROOT / 'index.html')
+    parser.add_argument('--check', action='store_true', help="enforce the bundle size and startup budgets")
+    parser.add_argument('--browser', action='store_true', help="with --check, time a headless Chromium load")
+    args = parser.parse_args()
+
+    files = build(args.output)
+    size = args.output.stat().st_size
+    print(f"wrote {args.output.name}: {len(files)} files, {size / 1024:.1f} KiB")
+    if not args.check:
+        return
+
+    checks = [('bundle size (KiB)', size / 1024, MAX_BUNDLE_BYTES / 1024),
+              ('cold start (ms)', cold_start_ms(files), MAX_COLD_START_MS)]
+    if args.browser:
+        checks.append(('browser start (ms)', browser_start_ms(args.output, MAX_BROWSER_START_MS),
+                       MAX_BROWSER_START_MS))
+
+    failed = False
+    for name, value, budget in checks:
+        status = 'ok' if value <= budget else 'OVER BUDGET'
+        failed |= value > budget
+        print(f"{name:<20} {value:>10.1f} / {budget:.0f}  {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
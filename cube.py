@@ -0,0 +1,105 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from instrument import timed
+
+DIMENSIONS = ['Country', 'Year', 'Indicator', 'Gender']
+
+
+def _axis_labels(column):
+    # Keep categorical order, otherwise order of first appearance; years ascend
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return list(column.cat.categories)
+    if column.name == 'Year':
+        return sorted(column.unique().tolist())
+    return pd.unique(column).tolist()
+
+
+class DataCube:
+    # Dense country x year x indicator x gender array of values. Missing
+    # cells are NaN and are dropped when slicing back to long format.
+
+    def __init__(self, values, countries, years, indicators, genders):
+        self.values = values
+        self.countries = list(countries)
+        self.years = list(years)
+        self.indicators = list(indicators)
+        self.genders = list(genders)
+        self._positions = [{label: i for i, label in enumerate(axis)} for axis in self.axes]
+        self.version = self._fingerprint()
+
+    def _fingerprint(self):
+        # Content hash used to key caches that derive from this data
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(repr(self.axes).encode())
+        digest.update(np.ascontiguousarray(self.values).tobytes())
+        return digest.hexdigest()
+
+    @property
+    def axes(self):
+        return [self.countries, self.years, self.indicators, self.genders]
+
+    @classmethod
+    def from_frame(cls, df):
+        axes = [_axis_labels(df[dim]) for dim in DIMENSIONS]
+        codes = [pd.Categorical(df[dim], categories=axis).codes for dim, axis in zip(DIMENSIONS, axes)]
+
+        values = np.full([len(axis) for axis in axes], np.nan, dtype=df['Value'].dtype)
+        values[tuple(codes)] = df['Value'].to_numpy()
+        return cls(values, *axes)
+
+    def to_dict(self):
+        # Compact JSON-friendly form used by the browser build
+        # str() gives the shortest repr, so float32 values stay e.g. 73.9
+        flat = [float(str(v)) for v in self.values.ravel()]
+        return {
+            'axes': {dim: [int(v) if dim == 'Year' else v for v in axis]
+                     for dim, axis in zip(DIMENSIONS, self.axes)},
+            'values': [None if v != v else v for v in flat],
+            'dtype': self.values.dtype.name,
+            'version': self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, snapshot):
+        axes = [snapshot['axes'][dim] for dim in DIMENSIONS]
+        values = np.array([np.nan if v is None else v for v in snapshot['values']],
+                          dtype=snapshot.get('dtype', 'float64'))
+        return cls(values.reshape([len(axis) for axis in axes]), *axes)
+
+    def position(self, dim, label):
+        return self._positions[DIMENSIONS.index(dim)][label]
+
+    def _select(self, axis, labels):
+        if labels is None:
+            return np.arange(len(self.axes[axis]))
+        positions = self._positions[axis]
+        return np.sort([positions[label] for label in labels if label in positions]).astype(np.intp)
+
+    def select(self, countries=None, years=None, indicators=None, genders=None):
+        # Positions along each axis; None selects the whole axis
+        return [self._select(axis, labels)
+                for axis, labels in enumerate([countries, years, indicators, genders])]
+
+    def array(self, countries=None, years=None, indicators=None, genders=None):
+        return self.values[np.ix_(*self.select(countries, years, indicators, genders))]
+
+    @timed('filter')
+    def frame(self, countries=None, years=None, indicators=None, genders=None):
+        positions = self.select(countries, years, indicators, genders)
+        block = self.values[np.ix_(*positions)]
+
+        grids = np.meshgrid(*positions, indexing='ij')
+        present = ~np.isnan(block)
+
+        columns = {}
+        for dim, axis, grid in zip(DIMENSIONS, self.axes, grids):
+            codes = grid[present]
+            if dim == 'Year':
+                columns[dim] = np.asarray(axis)[codes]
+            else:
+                columns[dim] = pd.Categorical.from_codes(codes, categories=axis)
+        columns['Value'] = block[present]
+        return pd.DataFrame(columns)
@@ -0,0 +1,156 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ['Brunei', 'Cambodia', 'Indonesia', 'Laos', 'Malaysia', 'Myanmar',
+             'Philippines', 'Singapore', 'Thailand', 'Vietnam', 'Papua New Guinea', 'Timor-Leste']
+
+YEARS = [2018, 2019, 2020, 2021, 2022, 2023]
+
+INDICATORS = {
+    'Internet Usage (%)': {'male': (60, 95), 'female': (55, 92), 'all': (57, 93)},
+    'Mobile Phone Ownership (%)': {'male': (70, 98), 'female': (65, 96), 'all': (67, 97)},
+    'Digital Literacy (%)': {'male': (45, 85), 'female': (40, 82), 'all': (42, 83)},
+    'ICT Employment (%)': {'male': (15, 35), 'female': (10, 30), 'all': (12, 32)},
+    'Online Shopping (%)': {'male': (30, 70), 'female': (35, 75), 'all': (32, 72)},
+    'Digital Banking (%)': {'male': (25, 80), 'female': (20, 78), 'all': (22, 79)}
+}
+
+GENDERS = ['male', 'female', 'all']
+
+# Seed for the sample data, shared by every worker, publish.py and the
+# browser build so they all show the same numbers
+SAMPLE_SEED = 2024
+
+# Sub-national and survey breakdowns, finest cells only (see ingest.split_chunk)
+BREAKDOWNS = ['Province', 'Age Band', 'Area', 'Income Quintile']
+AGE_BANDS = ['15-24', '25-34', '35-54', '55+']
+AREAS = ['urban', 'rural']
+INCOME_QUINTILES = ['Q1', 'Q2', 'Q3', 'Q4', 'Q5']
+
+# Compact column types: one code per row for the string dimensions, years fit
+# in int16 and values are percentages with one decimal
+DIMENSION_COLUMNS = ['Country', 'Indicator', 'Gender']
+YEAR_DTYPE = np.int16
+VALUE_DTYPE = np.float32
+
+# Country-specific bands: high countries sit in the top 10 points of each range,
+# low countries in the bottom 20 points.
+HIGH_BAND_COUNTRIES = ['Singapore']
+LOW_BAND_COUNTRIES = ['Cambodia', 'Laos', 'Myanmar']
+
+
+def _scaled_labels(base, n, template):
+    # Extend a label list past its natural length with synthetic names
+    labels = list(base[:n])
+    labels += [template.format(i + 1) for i in range(len(labels), n)]
+    return labels
+
+
+def generate_data(n_countries=None, n_years=None, n_indicators=None, seed=None):
+    countries = _scaled_labels(COUNTRIES, n_countries or len(COUNTRIES), 'Country {}')
+    years = np.arange(YEARS[-1] - (n_years or len(YEARS)) + 1, YEARS[-1] + 1)
+    base_names = list(INDICATORS)
+    indicators = _scaled_labels(base_names, n_indicators or len(base_names), 'Indicator {} (%)')
+
+    # Synthetic indicators cycle through the real indicators' ranges
+    ranges = np.array([[INDICATORS[base_names[i % len(base_names)]][g] for g in GENDERS]
+                       for i in range(len(indicators))], dtype=float)  # (indicator, gender, 2)
+    lo, hi = ranges[..., 0], ranges[..., 1]
+
+    # Per-country band: 0 = full range, 1 = high band, 2 = low band
+    band = np.zeros(len(countries), dtype=np.int8)
+    band[np.isin(countries, HIGH_BAND_COUNTRIES)] = 1
+    band[np.isin(countries, LOW_BAND_COUNTRIES)] = 2
+
+    # Broadcast the bounds over the country x year x indicator x gender grid
+    band = band[:, None, None, None]
+    lo_grid = np.where(band == 1, hi - 10, lo)
+    hi_grid = np.where(band == 1, hi, np.where(band == 2, lo + 20, hi))
+    shape = (len(countries), len(years), len(indicators), len(GENDERS))
+    lo_grid = np.broadcast_to(lo_grid, shape)
+    hi_grid = np.broadcast_to(hi_grid, shape)
+
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.uniform(lo_grid, hi_grid), 1).astype(VALUE_DTYPE)
+
+    c_idx, y_idx, i_idx, g_idx = (a.ravel() for a in np.meshgrid(
+        np.arange(shape[0]), np.arange(shape[1]), np.arange(shape[2]), np.arange(shape[3]),
+        indexing='ij'))
+
+    return pd.DataFrame({
+        'Country': pd.Categorical.from_codes(c_idx, categories=countries),
+        'Year': years.astype(YEAR_DTYPE)[y_idx],
+        'Indicator': pd.Categorical.from_codes(i_idx, categories=indicators),
+        'Gender': pd.Categorical.from_codes(g_idx, categories=GENDERS),
+        'Value': values.ravel()
+    })
+
+
+def generate_detail(frame, n_provinces=5, seed=None):
+    # Sample breakdown cells around each national value: every province,
+    # age band, area and income quintile shifts it by an offset, plus noise
+    rng = np.random.default_rng(seed)
+    present = pd.Categorical(frame['Country']).remove_unused_categories()
+    country_codes, countries = present.codes.astype(np.int64), list(present.categories)
+    shape = (n_provinces, len(AGE_BANDS), len(AREAS), len(INCOME_QUINTILES))
+    p_idx, a_idx, r_idx, q_idx = (a.ravel() for a in np.meshgrid(*map(np.arange, shape), indexing='ij'))
+    cells = len(p_idx)
+
+    province_offsets = rng.normal(0, 5, (len(countries), n_provinces))
+    cell_offsets = (np.array([6, 3, -2, -10])[a_idx] + np.array([5, -5])[r_idx]
+                    + np.array([-8, -4, 0, 4, 8])[q_idx])
+
+    rows = np.repeat(np.arange(len(frame)), cells)
+    country = country_codes[rows]
+    province = np.tile(p_idx, len(frame))
+    values = (frame['Value'].to_numpy(dtype=np.float64)[rows] + province_offsets[country, province]
+              + np.tile(cell_offsets, len(frame)) + rng.normal(0, 2, len(rows)))
+
+    provinces = [f'{name} Region {p + 1}' for name in countries for p in range(n_provinces)]
+    return pd.DataFrame({
+        'Country': pd.Categorical.from_codes(country, categories=countries),
+        'Province': pd.Categorical.from_codes(country * n_provinces + province, categories=provinces),
+        'Age Band': pd.Categorical.from_codes(np.tile(a_idx, len(frame)), categories=AGE_BANDS),
+        'Area': pd.Categorical.from_codes(np.tile(r_idx, len(frame)), categories=AREAS),
+        'Income Quintile': pd.Categorical.from_codes(np.tile(q_idx, len(frame)), categories=INCOME_QUINTILES),
+        'Year': frame['Year'].to_numpy().astype(YEAR_DTYPE)[rows],
+        'Indicator': pd.Categorical(frame['Indicator'])[rows],
+        'Gender': pd.Categorical(frame['Gender'])[rows],
+        'Value': np.round(np.clip(values, 0, 100), 1).astype(VALUE_DTYPE),
+    })
+
+
+def compact(df):
+    # Cast a long-format frame to the compact schema
+    df = df.astype({'Year': YEAR_DTYPE, 'Value': VALUE_DTYPE})
+    for col in DIMENSION_COLUMNS:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def memory_report(df):
+    # Bytes per column (deep, so object strings are counted) plus the total
+    usage = df.memory_usage(deep=True, index=True)
+    report = {col: int(n) for col, n in usage.items()}
+    report['total'] = int(usage.sum())
+    report['rows'] = len(df)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory report for the generated dataset")
+    parser.add_argument('--countries', type=int)
+    parser.add_argument('--years', type=int)
+    parser.add_argument('--indicators', type=int)
+    args = parser.parse_args()
+
+    df = generate_data(args.countries, args.years, args.indicators, seed=SAMPLE_SEED)
+    for key, value in memory_report(df).items():
+        print(f'{key:<10} {value:>14,}')
+
+
+if __name__ == '__main__':
+    main()
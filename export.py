@@ -0,0 +1,116 @@
+import gzip
+import importlib.util
+import io
+import os
+
+from lru import LRUCache
+
+CHUNK_ROWS = 100_000
+SAMPLE_ROWS = 2_000
+# Exports estimated above this size are only encoded when asked for
+INLINE_BYTES = int(os.environ.get('DIWA_EXPORT_INLINE_MB', 16)) * 1024 * 1024
+
+# Label -> (file extension, MIME type)
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+# Formats backed by a package that may be missing (e.g. in the browser build)
+OPTIONAL = {'Parquet': 'pyarrow', 'Excel': 'openpyxl'}
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt not in OPTIONAL or importlib.util.find_spec(OPTIONAL[fmt])]
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield start == 0, df.iloc[start:start + chunk_rows]
+
+
+def write(df, fmt, out, chunk_rows=CHUNK_ROWS):
+    # Encode df into the binary stream `out` one chunk at a time
+    if fmt in ('CSV', 'CSV (gzip)'):
+        raw = gzip.GzipFile(fileobj=out, mode='wb') if fmt == 'CSV (gzip)' else out
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        for first, chunk in _chunks(df, chunk_rows):
+            chunk.to_csv(text, header=first, index=False)
+        text.flush()
+        text.detach()
+        if raw is not out:
+            raw.close()
+    elif fmt == 'Parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(out, schema) as writer:
+            for _, chunk in _chunks(df, chunk_rows):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    elif fmt == 'Excel':
+        import pandas as pd
+
+        with pd.ExcelWriter(out, engine='openpyxl') as writer:
+            row = 0
+            for first, chunk in _chunks(df, chunk_rows):
+                chunk.to_excel(writer, index=False, header=first, startrow=row)
+                row += len(chunk) + first
+    else:
+        raise ValueError(f'unknown export format: {fmt}')
+
+
+def encode(df, fmt, chunk_rows=CHUNK_ROWS):
+    out = io.BytesIO()
+    write(df, fmt, out, chunk_rows)
+    return out.getvalue()
+
+
+def estimate_size(df, fmt):
+    # Encode a leading sample and scale by row count
+    if len(df) <= SAMPLE_ROWS:
+        return len(encode(df, fmt))
+    sample = len(encode(df.iloc[:SAMPLE_ROWS], fmt))
+    return int(sample * len(df) / SAMPLE_ROWS)
+
+
+def format_size(n):
+    for unit in ['B', 'KB', 'MB']:
+        if n < 1024:
+            return f'{n:.0f} {unit}'
+        n /= 1024
+    return f'{n:.1f} GB'
+
+
+class ExportService:
+    # Process-wide LRU of encoded exports keyed by (view key, format), bounded
+    # by total bytes. Repeated downloads of the same filtered view are free.
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self._cache = LRUCache(max_bytes=max_bytes)
+
+    def get(self, key, fmt):
+        return self._cache.get((key, fmt))
+
+    def export(self, key, fmt, frame):
+        # `frame` is a DataFrame or a callable returning one, evaluated on a miss
+        data = self.get(key, fmt)
+        if data is not None:
+            return data
+
+        data = encode(frame() if callable(frame) else frame, fmt)
+        self._cache.put((key, fmt), data)
+        return data
+
+    def estimate(self, key, fmt, frame):
+        # Encoded size of `frame`: exact for a small frame, whose bytes are
+        # cached so the export() that follows does not encode it again, and
+        # scaled from a sample otherwise
+        data = self.get(key, fmt)
+        if data is None and len(frame) <= SAMPLE_ROWS:
+            data = encode(frame, fmt)
+            self._cache.put((key, fmt), data)
+        return len(data) if data is not None else estimate_size(frame, fmt)
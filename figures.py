@@ -0,0 +1,268 @@
+import warnings
+from functools import lru_cache
+
+import numpy as np
+import plotly.colors as pcolors
+import plotly.express as px
+import plotly.graph_objects as go
+
+from instrument import stage
+from lru import LRUCache
+
+GENDER_COLORS = {'male': '#1f77b4', 'female': '#e91e63', 'all': '#ff7f0e'}
+
+
+def _canonical(value):
+    # Selections arrive as lists in widget order; the figure does not depend on it
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(value, key=str))
+    return value
+
+
+# Trace properties holding per-point data, the bulk of a figure's size
+ARRAY_PROPERTIES = ['x', 'y', 'z', 'r', 'theta', 'lat', 'lon', 'locations', 'ids',
+                    'text', 'hovertext', 'customdata', 'labels', 'values', 'base']
+# Layout, template and per-trace styling, roughly constant per figure
+FIGURE_BYTES = 6 * 1024
+TRACE_BYTES = 512
+
+
+def _array_bytes(value):
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biuf':
+        return value.nbytes
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return sum(_array_bytes(v) if isinstance(v, (np.ndarray, list, tuple)) else len(str(v)) for v in value)
+    return 0
+
+
+def figure_size(fig):
+    # Approximate size from the lengths of the trace arrays, without
+    # serializing the figure. Boundary GeoJSON is not counted: it is the
+    # GeometryStore's cached object, shared by every map that draws it.
+    return FIGURE_BYTES + sum(
+        TRACE_BYTES + sum(_array_bytes(trace[name]) for name in ARRAY_PROPERTIES if name in trace)
+        for trace in fig.data)
+
+
+class FigureCache(LRUCache):
+    # Process-wide LRU of built figures keyed by (chart, filters, data version).
+    # Size is accounted by figure_size() of each figure; least recently
+    # used figures are evicted once the byte budget is exceeded. Cached figures
+    # are shared between sessions and must not be mutated by callers.
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        super().__init__(max_bytes=max_bytes, sizeof=figure_size)
+
+    def cached(self, chart, filters, version, build):
+        def timed_build():
+            with stage('figure_build'):
+                return build()
+        return super().cached((chart, tuple(_canonical(f) for f in filters), version), timed_build)
+
+
+# Chart builders
+
+def indicator_bar(chart_data, indicator, gender, year):
+    fig = px.bar(chart_data, x='Country', y='Value',
+                 title=f'{indicator} - {gender.title()} ({year})',
+                 color='Value', color_continuous_scale='Reds')
+    fig.update_layout(height=500)
+    return fig
+
+
+def country_bar(country_summary, year):
+    fig = px.bar(country_summary, x='Country', y='Value',
+                 title=f'Average Digital Inclusion Score by Country ({year})',
+                 color='Value', color_continuous_scale='Pinkyl')
+    fig.update_layout(height=500)
+    return fig
+
+
+def indicator_trends(trend_data, gender):
+    fig = px.line(trend_data, x='Year', y='Value', color='Indicator',
+                  title=f'Trends Over Time - {gender.title()}',
+                  color_discrete_sequence=px.colors.qualitative.Set1)
+    fig.update_layout(height=500)
+    return fig
+
+
+def add_projection(fig, observed, projection, group):
+    # Dashed continuation of each line of a px.line trend figure, joined to
+    # its last observed point, with a shaded 95% band when the projection has
+    # Lower/Upper columns. Lines keep their trace colour and legend entry.
+    colors = {trace.name: trace.line.color for trace in fig.data}
+    for name, future in projection.groupby(group, observed=True):
+        past = observed[observed[group] == name]
+        if str(name) not in colors or past.empty or future.empty:
+            continue
+        color = colors[str(name)]
+        last = past.loc[past['Year'].idxmax()]
+        if 'Lower' in future and future['Lower'].notna().all():
+            years = future['Year'].tolist()
+            r, g, b = pcolors.hex_to_rgb(color) if color.startswith('#') else pcolors.unlabel_rgb(color)
+            fig.add_trace(go.Scatter(
+                x=[last['Year'], *years, *years[::-1], last['Year']],
+                y=[last['Value'], *future['Upper'], *future['Lower'][::-1], last['Value']],
+                fill='toself', fillcolor=f'rgba({r:.0f}, {g:.0f}, {b:.0f}, 0.15)', line={'width': 0, 'color': color},
+                hoverinfo='skip', legendgroup=str(name), showlegend=False))
+        fig.add_trace(go.Scatter(
+            x=[last['Year'], *future['Year']], y=[last['Value'], *future['Value']],
+            mode='lines', line={'color': color, 'dash': 'dash'}, name=f'{name} (projected)',
+            legendgroup=str(name), showlegend=False,
+            hovertemplate='%{x}: %{y:.1f} (projected)<extra>' + str(name) + '</extra>'))
+    for trace in fig.data:
+        trace.legendgroup = trace.legendgroup or trace.name
+    return fig
+
+
+def country_choropleth(geo_data, geojson, indicator, gender, year):
+    # geojson=None draws Plotly's built-in country outlines, matched on the
+    # same ISO3 ids, for deployments without boundary files
+    boundaries = {'geojson': geojson, 'featureidkey': 'id'} if geojson is not None else {'locationmode': 'ISO-3'}
+    fig = px.choropleth(
+        geo_data,
+        locations='id',
+        **boundaries,
+        color='Value',
+        hover_name='Country',
+        hover_data={'Value': ':.1f', 'Indicator': True, 'id': False},
+        color_continuous_scale='Reds',
+        title=f'{indicator} - {gender.title()} ({year})'
+    )
+
+    fig.update_geos(fitbounds='locations', visible=False, showland=True, landcolor='lightgray')
+    fig.update_layout(height=600)
+    return fig
+
+
+def province_choropleth(geo_data, geojson, indicator, title):
+    fig = px.choropleth(
+        geo_data,
+        geojson=geojson,
+        locations='id',
+        featureidkey='id',
+        color='Value',
+        hover_name='Province',
+        hover_data={'Value': ':.1f', 'id': False},
+        color_continuous_scale='Reds',
+        title=title
+    )
+
+    fig.update_geos(fitbounds='locations', visible=False, showland=True, landcolor='lightgray')
+    fig.update_layout(height=600, coloraxis_colorbar_title=indicator)
+    return fig
+
+
+def breakdown_bar(table, column, indicator, title):
+    fig = px.bar(table.sort_values('Value'), x='Value', y=column, orientation='h',
+                 title=title,
+                 color='Value', color_continuous_scale='Reds',
+                 hover_data={'Value': ':.1f', 'Cells': True})
+    fig.update_layout(height=max(300, 40 * len(table) + 120), xaxis_title=indicator,
+                      yaxis={'type': 'category'})
+    return fig
+
+
+def gender_trends(trend_data, indicator, country):
+    fig = px.line(trend_data, x='Year', y='Value', color='Gender',
+                  title=f'{indicator} Trends in {country}',
+                  markers=True,
+                  color_discrete_map=GENDER_COLORS)
+    fig.update_layout(height=400)
+    return fig
+
+
+def comparison_bar(comp_data, indicator, year):
+    fig = px.bar(comp_data, x='Country', y='Value', color='Gender',
+                 title=f'{indicator} Comparison ({year})',
+                 barmode='group',
+                 color_discrete_map=GENDER_COLORS)
+    fig.update_layout(height=500)
+    return fig
+
+
+def comparison_trends(trend_data, indicator):
+    fig = px.line(trend_data, x='Year', y='Value', color='Country',
+                  title=f'{indicator} Trends Comparison',
+                  markers=True,
+                  color_discrete_sequence=px.colors.qualitative.Set1)
+    fig.update_layout(height=500)
+    return fig
+
+
+def gap_trends(gap_data, indicator):
+    fig = px.line(gap_data, x='Year', y='Gap', color='Country',
+                  title=f'{indicator} Gender Gap (male - female)',
+                  markers=True,
+                  color_discrete_sequence=px.colors.qualitative.Set1)
+    fig.add_hline(y=0, line_dash='dot', line_color='gray')
+    fig.update_layout(height=500, yaxis_title='Gap (percentage points)')
+    return fig
+
+
+def parity_bar(gap_table, indicator):
+    closing = gap_table[np.isfinite(gap_table['Years to Parity'])].sort_values('Years to Parity')
+    fig = px.bar(closing, x='Country', y='Years to Parity',
+                 title=f'{indicator} - Projected Years to Gender Parity',
+                 color='Closing (pp/yr)', color_continuous_scale='Teal',
+                 hover_data={'Latest Gap': ':.1f', 'Parity Year': ':.0f'})
+    fig.update_layout(height=500)
+    return fig
+
+
+class RadarTraces:
+    # Closed radar outlines (first indicator repeated at the end) for every
+    # country and the ASEAN average, one (country, indicator) array per year.
+    # Changing the country selection only slices rows out of the cached array.
+
+    def __init__(self, cube, maxsize=64):
+        self.cube = cube
+        self.version = cube.version
+        self.matrix = lru_cache(maxsize=maxsize)(self._matrix)
+
+    def _matrix(self, year):
+        cube = self.cube
+        block = cube.values[:, cube.position('Year', year), :, cube.position('Gender', 'all')]
+        with warnings.catch_warnings(action='ignore', category=RuntimeWarning):
+            average = np.nanmean(block, axis=0)
+        return np.concatenate([block, block[:, :1]], axis=1), np.append(average, average[0])
+
+    def select(self, year, countries, top_n=None):
+        # (names, rows) for the chosen countries, or for the top_n of them by
+        # mean score followed by the ASEAN average
+        matrix, average = self.matrix(year)
+        positions = self.cube.select(countries=countries)[0]
+        rows = matrix[positions]
+        keep = ~np.isnan(rows).all(axis=1)
+        positions, rows = positions[keep], rows[keep]
+        if top_n is None:
+            return [self.cube.countries[i] for i in positions], rows
+        with warnings.catch_warnings(action='ignore', category=RuntimeWarning):
+            order = np.argsort(-np.nanmean(rows[:, :-1], axis=1), kind='stable')[:top_n]
+        names = [self.cube.countries[i] for i in positions[order]] + ['ASEAN average']
+        return names, np.vstack([rows[order], average])
+
+
+def radar(names, rows, indicators, year):
+    # One Scatterpolar per row of the (country, indicator) array, added in a
+    # single call; fills are dropped once outlines would hide each other
+    theta = list(indicators) + list(indicators[:1])
+    fill = 'toself' if len(names) <= 10 else 'none'
+    traces = [go.Scatterpolar(r=row, theta=theta, fill=fill, name=name)
+              for name, row in zip(names, rows)]
+    if names and names[-1] == 'ASEAN average':
+        traces[-1].update(fill='none', line=dict(color='black', dash='dash', width=3))
+
+    fig = go.Figure()
+    fig.add_traces(traces)
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )),
+        showlegend=True,
+        title=f"All Indicators Comparison ({year})",
+        height=600
+    )
+    return fig
@@ -0,0 +1,130 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Last projected year, the SDG target year by default
+TARGET_YEAR = int(os.environ.get('DIWA_FORECAST_YEAR', 2030))
+
+# Two-sided 95% Student t quantiles by residual degrees of freedom
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042}
+
+# Logistic fits work on logit(value / 100), kept off the 0 and 100 asymptotes
+LOGIT_CLIP = 0.005
+
+MODELS = ['linear', 'logistic']
+
+
+def t_quantile(dof):
+    # Nearest tabulated value at or below dof, so intervals err on the wide
+    # side; beyond the table that is the dof=30 value
+    dof = np.asarray(dof)
+    keys = np.array(sorted(T_95))
+    table = np.array([T_95[k] for k in keys])
+    index = np.clip(np.searchsorted(keys, dof, side='right') - 1, 0, len(keys) - 1)
+    return table[index]
+
+
+def _fit(x, y, present):
+    # Masked least squares of y on x along axis 1 for every series at once;
+    # returns slope, intercept, residual variance, x mean, Sxx and n
+    n = present.sum(axis=1)
+    y = np.where(present, y, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = (x * present).sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        dx = np.where(present, x - x_mean[:, None], 0.0)
+        sxx = (dx ** 2).sum(axis=1)
+        slope = (dx * (y - y_mean[:, None])).sum(axis=1) / sxx
+        intercept = y_mean - slope * x_mean
+        residuals = np.where(present, y - (intercept[:, None] + slope[:, None] * x), 0.0)
+        variance = (residuals ** 2).sum(axis=1) / (n - 2)
+    return slope, intercept, variance, x_mean, sxx, n
+
+
+class Forecasts:
+    # Projections to TARGET_YEAR for every country x indicator x gender
+    # series, fitted together: ordinary least squares on the values (linear)
+    # and on their logits (logistic growth towards 100%), keeping whichever
+    # fits the observed years better. Arrays are (country, future year,
+    # indicator, gender), like the cube, with 95% prediction intervals.
+
+    def __init__(self, cube, target_year=TARGET_YEAR):
+        self.cube = cube
+        self.version = cube.version
+        self.years = list(range(cube.years[-1] + 1, max(target_year, cube.years[-1]) + 1))
+
+        # One row per series, one column per observed year
+        values = np.moveaxis(cube.values, 1, -1).astype(np.float64)  # (country, indicator, gender, year)
+        shape = values.shape[:-1]
+        y = values.reshape(-1, values.shape[-1])
+        present = ~np.isnan(y)
+        x = np.asarray(cube.years, dtype=np.float64)[None, :]
+        future = np.asarray(self.years, dtype=np.float64)[None, :]
+
+        share = np.clip(y / 100, LOGIT_CLIP, 1 - LOGIT_CLIP)
+        fits = {'linear': (_fit(x, y, present), lambda z: z),
+                'logistic': (_fit(x, np.log(share / (1 - share)), present), lambda z: 100 / (1 + np.exp(-z)))}
+
+        predictions, errors = {}, {}
+        for model, ((slope, intercept, variance, x_mean, sxx, n), back) in fits.items():
+            with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+                fitted = back(intercept[:, None] + slope[:, None] * x)
+                errors[model] = np.where(present, (fitted - np.where(present, y, 0.0)) ** 2, 0.0).sum(axis=1)
+                centre = intercept[:, None] + slope[:, None] * future
+                spread = t_quantile(np.maximum(n - 2, 1))[:, None] * np.sqrt(
+                    variance[:, None] * (1 + 1 / n[:, None] + (future - x_mean[:, None]) ** 2 / sxx[:, None]))
+                predictions[model] = (back(centre), back(centre - spread), back(centre + spread))
+
+        # Logistic where it fits better; linear otherwise (and on ties)
+        logistic = errors['logistic'] < errors['linear']
+        mean, lower, upper = (np.where(logistic[:, None], log, lin)
+                              for lin, log in zip(predictions['linear'], predictions['logistic']))
+        n = present.sum(axis=1)
+        mean[n < 2] = np.nan
+        lower[n < 3] = upper[n < 3] = np.nan  # no residual degrees of freedom for an interval
+
+        def to_cube(array):
+            return np.moveaxis(np.clip(array, 0, 100).reshape(*shape, len(self.years)), -1, 1)
+
+        self.mean, self.lower, self.upper = to_cube(mean), to_cube(lower), to_cube(upper)
+        self.models = np.where(logistic, 1, 0).reshape(shape)  # index into MODELS; (country, indicator, gender)
+
+    def frame(self, countries=None, indicators=None, genders=None):
+        # Long Country / Year / Indicator / Gender / Value / Lower / Upper / Model frame
+        c, _, i, g = self.cube.select(countries=countries, indicators=indicators, genders=genders)
+        grids = [grid.ravel() for grid in np.meshgrid(c, np.arange(len(self.years)), i, g, indexing='ij')]
+        mean = self.mean[tuple(grids)]
+        present = ~np.isnan(mean)
+        cc, yy, ii, gg = (grid[present] for grid in grids)
+        return pd.DataFrame({
+            'Country': pd.Categorical.from_codes(cc, categories=self.cube.countries),
+            'Year': np.asarray(self.years)[yy],
+            'Indicator': pd.Categorical.from_codes(ii, categories=self.cube.indicators),
+            'Gender': pd.Categorical.from_codes(gg, categories=self.cube.genders),
+            'Value': mean[present],
+            'Lower': self.lower[cc, yy, ii, gg],
+            'Upper': self.upper[cc, yy, ii, gg],
+            'Model': np.asarray(MODELS, dtype=object)[self.models[cc, ii, gg]],
+        })
+
+    def regional(self, countries, gender, population=None):
+        # Mean projection per future year and indicator over a country
+        # selection, weighted like the Dashboard averages when population
+        # (one weight per cube country) is given
+        c = self.cube.select(countries=countries)[0]
+        block = self.mean[c, :, :, self.cube.position('Gender', gender)]  # (country, year, indicator)
+        weights = np.ones(len(c)) if population is None else np.nan_to_num(np.asarray(population)[c])
+        weights = np.where(np.isnan(block), 0.0, weights[:, None, None])
+        with warnings.catch_warnings(action='ignore', category=RuntimeWarning):
+            means = np.nansum(block * weights, axis=0) / weights.sum(axis=0)
+        years, indicators = np.meshgrid(np.arange(len(self.years)), np.arange(len(self.cube.indicators)),
+                                        indexing='ij')
+        frame = pd.DataFrame({
+            'Year': np.asarray(self.years)[years.ravel()],
+            'Indicator': pd.Categorical.from_codes(indicators.ravel(), categories=self.cube.indicators),
+            'Value': means.ravel(),
+        })
+        return frame.dropna()
@@ -0,0 +1,78 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+class GapAnalytics:
+    # Male - female gap for every country x year x indicator, with
+    # year-over-year changes, least-squares trend slopes and projected
+    # years to parity, all computed from the cube in one pass.
+
+    def __init__(self, cube):
+        self.cube = cube
+        self.version = cube.version
+        # No gap anywhere when the data lacks either gender
+        male, female = (cube.values[..., cube.position('Gender', gender)].astype(np.float64)
+                        if gender in cube.genders else np.full(cube.values.shape[:3], np.nan)
+                        for gender in ('male', 'female'))
+        self.gaps = male - female  # (country, year, indicator)
+        self.changes = np.diff(self.gaps, axis=1, prepend=np.nan)
+
+        years = np.asarray(cube.years, dtype=np.float64)[None, :, None]
+        present = ~np.isnan(self.gaps)
+        count = present.sum(axis=1)
+        gaps = np.where(present, self.gaps, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x_mean = (years * present).sum(axis=1) / count
+            y_mean = gaps.sum(axis=1) / count
+            dx = np.where(present, years - x_mean[:, None, :], 0.0)
+            slopes = (dx * (gaps - y_mean[:, None, :])).sum(axis=1) / (dx ** 2).sum(axis=1)
+        self.slopes = np.where(count >= 2, slopes, np.nan)  # (country, indicator), pp per year
+
+        # Latest observed gap and its year per series
+        last = present.shape[1] - 1 - np.argmax(present[:, ::-1, :], axis=1)
+        self.latest = np.take_along_axis(self.gaps, last[:, None, :], axis=1)[:, 0, :]
+        self.latest_change = np.take_along_axis(self.changes, last[:, None, :], axis=1)[:, 0, :]
+        self.latest_years = np.where(count > 0, np.asarray(cube.years)[last], -1)
+
+        # Closing rate is the slope towards zero; only a closing gap reaches parity
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.closing = -np.sign(self.latest) * self.slopes
+            self.years_to_parity = np.where(self.closing > 0, np.abs(self.latest) / self.closing, np.inf)
+        self.years_to_parity[self.latest == 0] = 0
+        self.years_to_parity[np.isnan(self.latest) | np.isnan(self.slopes)] = np.nan
+
+    def table(self, countries=None, indicators=None):
+        # One row per country x indicator, ready for a sortable table
+        c, i = self.cube.select(countries=countries, indicators=indicators)[0::2]
+        cc, ii = (grid.ravel() for grid in np.meshgrid(c, i, indexing='ij'))
+        parity_years = self.years_to_parity[cc, ii]
+        with warnings.catch_warnings(action='ignore', category=RuntimeWarning):
+            parity_year = np.where(np.isfinite(parity_years), self.latest_years[cc, ii] + np.ceil(parity_years), np.nan)
+        frame = pd.DataFrame({
+            'Country': np.asarray(self.cube.countries, dtype=object)[cc],
+            'Indicator': np.asarray(self.cube.indicators, dtype=object)[ii],
+            'Latest Gap': self.latest[cc, ii],
+            'YoY Change': self.latest_change[cc, ii],
+            'Trend (pp/yr)': self.slopes[cc, ii],
+            'Closing (pp/yr)': self.closing[cc, ii],
+            'Years to Parity': parity_years,
+            'Parity Year': parity_year,
+        })
+        return frame[~np.isnan(frame['Latest Gap'].to_numpy())]
+
+    def series(self, countries=None, indicators=None):
+        # Long Country / Year / Indicator / Gap / YoY Change frame
+        positions = self.cube.select(countries=countries, indicators=indicators)
+        c, y, i = positions[0], positions[1], positions[2]
+        block = self.gaps[np.ix_(c, y, i)]
+        grids = np.meshgrid(c, y, i, indexing='ij')
+        present = ~np.isnan(block)
+        return pd.DataFrame({
+            'Country': pd.Categorical.from_codes(grids[0][present], categories=self.cube.countries),
+            'Year': np.asarray(self.cube.years)[grids[1][present]],
+            'Indicator': pd.Categorical.from_codes(grids[2][present], categories=self.cube.indicators),
+            'Gap': block[present],
+            'YoY Change': self.changes[np.ix_(c, y, i)][present],
+        })
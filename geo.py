@@ -0,0 +1,147 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GEO_DIR = Path('data/geo')
+
+# Detail level -> (Douglas-Peucker tolerance, decimal places kept), in degrees
+LEVELS = {
+    'low': (0.05, 2),
+    'medium': (0.01, 3),
+    'high': (0.002, 4),
+}
+
+# Feature properties checked, in order, for the ID of a boundary
+ID_PROPERTIES = ['iso_a3', 'ISO_A3', 'GID_0', 'shapeGroup', 'adm0_a3', 'GID_1', 'shapeISO', 'id']
+
+# Feature properties checked, in order, for the name a region is joined on
+NAME_PROPERTIES = ['NAME_1', 'shapeName', 'name', 'NAME']
+
+COUNTRY_ISO3 = {
+    'Brunei': 'BRN', 'Cambodia': 'KHM', 'Indonesia': 'IDN', 'Laos': 'LAO',
+    'Malaysia': 'MYS', 'Myanmar': 'MMR', 'Philippines': 'PHL', 'Singapore': 'SGP',
+    'Thailand': 'THA', 'Vietnam': 'VNM', 'Papua New Guinea': 'PNG', 'Timor-Leste': 'TLS',
+}
+
+
+def simplify(points, tolerance):
+    # Douglas-Peucker on an (n, 2) ring, with the distance step vectorized
+    # over each segment's points and an explicit stack instead of recursion
+    n = len(points)
+    if n < 5:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.extend([(start, split), (split, end)])
+    return points[keep]
+
+
+def _quantize_ring(ring, tolerance, decimals):
+    points = np.round(simplify(np.asarray(ring, dtype=float), tolerance), decimals)
+    # Drop points that collapsed onto their predecessor after rounding
+    points = points[np.r_[True, np.any(np.diff(points, axis=0) != 0, axis=1)]]
+    if len(points) < 4:
+        return None
+    return points.tolist()
+
+
+def _quantize_polygon(rings, tolerance, decimals):
+    rings = [_quantize_ring(ring, tolerance, decimals) for ring in rings]
+    if rings[0] is None:
+        return None
+    return [ring for ring in rings if ring is not None]
+
+
+def quantize_geometry(geometry, tolerance, decimals):
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        return geometry
+    if not polygons:
+        return {'type': 'MultiPolygon', 'coordinates': []}
+
+    simplified = [p for p in (_quantize_polygon(rings, tolerance, decimals) for rings in polygons) if p]
+    # Keep tiny territories (e.g. Singapore at low detail) by retrying their
+    # largest polygon's outer ring at progressively finer detail
+    largest = max(polygons, key=lambda rings: len(rings[0]))
+    while not simplified and decimals < 6:
+        tolerance, decimals = tolerance / 5, decimals + 1
+        ring = _quantize_ring(largest[0], tolerance, decimals)
+        simplified = [[ring]] if ring else []
+    return {'type': 'MultiPolygon', 'coordinates': simplified}
+
+
+def feature_id(feature):
+    properties = feature.get('properties') or {}
+    for key in ID_PROPERTIES:
+        if properties.get(key):
+            return str(properties[key])
+    return str(feature.get('id', ''))
+
+
+class GeometryStore:
+    # Boundary files from data/geo, one layer per file stem (e.g. countries,
+    # provinces). Each layer is simplified and quantized once per detail level.
+
+    def __init__(self, geo_dir=GEO_DIR):
+        self.layers = {}
+        for path in sorted(Path(geo_dir).glob('*.geojson')) + sorted(Path(geo_dir).glob('*.json')):
+            collection = json.loads(path.read_text())
+            self.layers[path.stem] = [
+                {'type': 'Feature', 'id': feature_id(f), 'geometry': f['geometry'],
+                 'properties': {k: v for k, v in (f.get('properties') or {}).items() if isinstance(v, str)}}
+                for f in collection['features'] if f.get('geometry') and f['geometry'].get('coordinates')
+            ]
+        self.geojson = lru_cache(maxsize=None)(self._geojson)
+
+    def has_layer(self, layer):
+        return layer in self.layers
+
+    def ids_by_name(self, layer):
+        # Feature name -> ID, for data labelled by name (e.g. provinces)
+        ids = {}
+        for feature in self.layers[layer]:
+            name = next((feature['properties'][key] for key in NAME_PROPERTIES if key in feature['properties']), None)
+            if name:
+                ids[name] = feature['id']
+        return ids
+
+    def _geojson(self, layer, level):
+        tolerance, decimals = LEVELS[level]
+        return {
+            'type': 'FeatureCollection',
+            'features': [{'type': 'Feature', 'id': f['id'],
+                          'geometry': quantize_geometry(f['geometry'], tolerance, decimals),
+                          'properties': {}}
+                         for f in self.layers[layer]],
+        }
+
+    def size(self, layer, level):
+        return len(json.dumps(self.geojson(layer, level), separators=(',', ':')))
+
+
+def join_country_ids(frame):
+    # Attach the ISO3 feature ID to each row with a vectorized merge
+    ids = pd.DataFrame({'Country': list(COUNTRY_ISO3), 'id': list(COUNTRY_ISO3.values())})
+    return frame.merge(ids, on='Country', how='inner')
@@ -0,0 +1,333 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data import BREAKDOWNS, COUNTRIES, SAMPLE_SEED, compact, generate_detail
+
+try:
+    import fcntl
+except ImportError:  # Windows: unique temp files alone keep the outputs intact
+    fcntl = None
+
+RAW_DIR = Path('data/raw')
+CACHE_DIR = Path('data/cache/parquet')
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.refresh.lock'
+CHUNK_ROWS = 250_000
+
+SCHEMA = pa.schema([
+    ('Country', pa.dictionary(pa.int32(), pa.string())),
+    ('Year', pa.int16()),
+    ('Indicator', pa.dictionary(pa.int32(), pa.string())),
+    ('Gender', pa.dictionary(pa.int32(), pa.string())),
+    ('Value', pa.float32()),
+])
+
+# Header spellings used by ITU / World Bank / UN exports, lower-cased
+COLUMN_ALIASES = {
+    'Country': ['country', 'country name', 'country_name', 'economy', 'entity', 'ref_area_name'],
+    'Year': ['year', 'time', 'time period', 'time_period'],
+    'Indicator': ['indicator', 'indicator name', 'indicator_name', 'series name', 'series'],
+    'Gender': ['gender', 'sex'],
+    'Value': ['value', 'obs_value', 'obs value'],
+}
+BREAKDOWN_ALIASES = {
+    'Province': ['province', 'region', 'subnational', 'admin1'],
+    'Age Band': ['age', 'age band', 'age_band', 'age group', 'age_group'],
+    'Area': ['area', 'urban/rural', 'urban_rural', 'location'],
+    'Income Quintile': ['income quintile', 'income_quintile', 'quintile', 'wealth quintile'],
+}
+# Breakdown labels meaning "not broken down"
+TOTAL_VALUES = ['', 'total', 'national', 'all']
+
+# Breakdown cells, written next to each national partition as <stem>.detail.parquet
+DETAIL_SCHEMA = pa.schema(
+    [SCHEMA.field('Country')]
+    + [(name, pa.dictionary(pa.int32(), pa.string())) for name in BREAKDOWNS]
+    + [SCHEMA.field(name) for name in ['Year', 'Indicator', 'Gender', 'Value']])
+
+GENDER_VALUES = {
+    'female': 'female', 'f': 'female', 'women': 'female', 'woman': 'female',
+    'male': 'male', 'm': 'male', 'men': 'male', 'man': 'male',
+    'all': 'all', 'total': 'all', 't': 'all', '_t': 'all', 'both sexes': 'all', 'both': 'all',
+}
+
+# World Bank wide exports use "2018" or "2018 [YR2018]" as year columns
+YEAR_COLUMN = re.compile(r'^(\d{4})(\s*\[YR\d{4}\])?$')
+# World Bank series carry the gender in the name, e.g. "..., female (% of ...)"
+GENDER_IN_INDICATOR = re.compile(r',\s*(female|male)\b', re.IGNORECASE)
+
+
+def _rename_columns(chunk):
+    lookup = {alias: canonical for canonical, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    return chunk.rename(columns={col: lookup[col.strip().lower()] for col in chunk.columns
+                                 if col.strip().lower() in lookup})
+
+
+def split_chunk(chunk):
+    # National rows (every breakdown column a total) and breakdown cells (none
+    # a total). Partial totals, e.g. a province across all age bands, are
+    # dropped: queries recompute them from the cells. Returns (national,
+    # cells, canonical name -> source column of the breakdowns present).
+    lookup = {alias: name for name, aliases in BREAKDOWN_ALIASES.items() for alias in aliases}
+    breakdowns = {lookup[col.strip().lower()]: col for col in chunk.columns if col.strip().lower() in lookup}
+    totals = pd.DataFrame({name: chunk[col].fillna('').astype(str).str.strip().str.lower().isin(TOTAL_VALUES)
+                           for name, col in breakdowns.items()}, index=chunk.index)
+    national = chunk[totals.all(axis=1)].drop(columns=list(breakdowns.values()))
+    cells = chunk[~totals.any(axis=1)] if breakdowns else chunk.iloc[:0]
+    return national, cells, breakdowns
+
+
+def normalize_chunk(chunk, breakdowns=None):
+    # Long compact frame; with breakdowns, also one column per BREAKDOWNS
+    # entry, 'all' where the source has no such column
+    breakdowns = breakdowns or {}
+    chunk = _rename_columns(chunk.rename(columns={col: name for name, col in breakdowns.items()}))
+
+    year_columns = [col for col in chunk.columns if YEAR_COLUMN.match(str(col).strip())]
+    if 'Year' not in chunk.columns and year_columns:
+        id_columns = [col for col in ['Country', 'Indicator', 'Gender', *breakdowns] if col in chunk.columns]
+        chunk = chunk.melt(id_vars=id_columns, value_vars=year_columns,
+                           var_name='Year', value_name='Value')
+        chunk['Year'] = chunk['Year'].str.slice(0, 4)
+
+    missing = [col for col in ['Country', 'Year', 'Indicator', 'Value'] if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"missing required columns: {', '.join(missing)}")
+
+    indicator = chunk['Indicator'].astype(str).str.strip()
+    if 'Gender' in chunk.columns:
+        gender = chunk['Gender'].astype(str).str.strip().str.lower().map(GENDER_VALUES)
+    else:
+        gender = indicator.str.extract(GENDER_IN_INDICATOR, expand=False).str.lower().fillna('all')
+        indicator = indicator.str.replace(GENDER_IN_INDICATOR, '', regex=True)
+
+    out = pd.DataFrame({
+        'Country': chunk['Country'].astype(str).str.strip(),
+        'Year': pd.to_numeric(chunk['Year'], errors='coerce'),
+        'Indicator': indicator,
+        'Gender': gender,
+        'Value': pd.to_numeric(chunk['Value'], errors='coerce'),
+    })
+    if breakdowns:
+        for name in BREAKDOWNS:
+            out[name] = chunk[name].astype(str).str.strip() if name in breakdowns else 'all'
+        out = out[DETAIL_SCHEMA.names]
+    out = compact(out.dropna())
+    if breakdowns:
+        out = out.astype({name: 'category' for name in BREAKDOWNS})
+    return out
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(cache_dir=CACHE_DIR):
+    path = Path(cache_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def detail_target(target):
+    return target.with_name(f'{target.stem}.detail.parquet')
+
+
+def _temp_path(target):
+    # A temp file of this process's own next to target, moved into place with
+    # os.replace, so concurrent writers never share or expose a partial file
+    with tempfile.NamedTemporaryFile(dir=target.parent, prefix=f'.{target.name}.', suffix='.tmp',
+                                     delete=False) as f:
+        return Path(f.name)
+
+
+def _write_text(path, text):
+    tmp = _temp_path(path)
+    try:
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+@contextmanager
+def _refresh_lock(cache_dir):
+    # One refresh at a time across worker processes; the others wait, then
+    # find the partitions current in the manifest
+    with open(cache_dir / LOCK_NAME, 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_partition(source, target, chunk_rows=CHUNK_ROWS):
+    # Writes the national partition and, when the source has breakdown rows,
+    # its detail partition; returns (national rows, detail rows)
+    tmp = _temp_path(target)
+    detail_tmp = None
+    rows = detail_rows = 0
+    detail_writer = None
+    try:
+        try:
+            with pq.ParquetWriter(tmp, SCHEMA) as writer:
+                for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=str, na_values=['..', '']):
+                    national, cells, breakdowns = split_chunk(chunk)
+                    national = normalize_chunk(national)
+                    writer.write_table(pa.Table.from_pandas(national, schema=SCHEMA, preserve_index=False))
+                    rows += len(national)
+                    if len(cells):
+                        cells = normalize_chunk(cells, breakdowns)
+                        if detail_writer is None:
+                            detail_tmp = _temp_path(detail_target(target))
+                            detail_writer = pq.ParquetWriter(detail_tmp, DETAIL_SCHEMA)
+                        detail_writer.write_table(pa.Table.from_pandas(cells, schema=DETAIL_SCHEMA,
+                                                                       preserve_index=False))
+                        detail_rows += len(cells)
+        finally:
+            if detail_writer:
+                detail_writer.close()
+        os.replace(tmp, target)
+        if detail_tmp:
+            os.replace(detail_tmp, detail_target(target))
+    finally:
+        # Left behind only when writing failed
+        tmp.unlink(missing_ok=True)
+        if detail_tmp:
+            detail_tmp.unlink(missing_ok=True)
+    if not detail_rows:
+        detail_target(target).unlink(missing_ok=True)
+    return rows, detail_rows
+
+
+def has_sources(raw_dir=RAW_DIR):
+    return any(Path(raw_dir).glob('*.csv'))
+
+
+def refresh(raw_dir=RAW_DIR, cache_dir=CACHE_DIR, force=False):
+    # Rebuild the partitions whose source CSV changed; returns the manifest
+    raw_dir, cache_dir = Path(raw_dir), Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with _refresh_lock(cache_dir):
+        return _refresh(raw_dir, cache_dir, force)
+
+
+def _refresh(raw_dir, cache_dir, force):
+    old = read_manifest(cache_dir)
+    manifest = {}
+
+    for source in sorted(raw_dir.glob('*.csv')):
+        stat = source.stat()
+        target = cache_dir / f'{source.stem}.parquet'
+        entry = old.get(source.name)
+
+        # Entries from before detail partitions existed are rebuilt once
+        if not force and entry and 'detail_rows' in entry and target.exists():
+            if entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                manifest[source.name] = entry
+                continue
+            digest = file_digest(source)
+            if entry['sha256'] == digest:
+                manifest[source.name] = {**entry, 'mtime': stat.st_mtime, 'size': stat.st_size}
+                continue
+        else:
+            digest = file_digest(source)
+
+        rows, detail_rows = write_partition(source, target)
+        manifest[source.name] = {
+            'partition': target.name,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'sha256': digest,
+            'rows': rows,
+            'detail_rows': detail_rows,
+        }
+
+    # Drop partitions whose source file is gone
+    for name, entry in old.items():
+        if name not in manifest:
+            (cache_dir / entry['partition']).unlink(missing_ok=True)
+            detail_target(cache_dir / entry['partition']).unlink(missing_ok=True)
+
+    _write_text(cache_dir / MANIFEST_NAME, json.dumps(manifest, indent=2))
+    return manifest
+
+
+def sample_detail(cube, cache_dir=CACHE_DIR, seed=SAMPLE_SEED):
+    # Sample breakdowns around the sample cube when data/raw is empty, for
+    # the real countries only (the synthetic ones have no map or profile),
+    # written one country at a time to data/cache/parquet once per data
+    # version and shared by every worker; returns the Parquet path
+    cache_dir = Path(cache_dir)
+    target = cache_dir / f'sample-{cube.version}.detail.parquet'
+    if target.exists():
+        return target
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with _refresh_lock(cache_dir):
+        if target.exists():
+            return target
+        tmp = _temp_path(target)
+        try:
+            with pq.ParquetWriter(tmp, DETAIL_SCHEMA) as writer:
+                for i, country in enumerate(c for c in COUNTRIES if c in cube.countries):
+                    cells = generate_detail(cube.frame(countries=[country]), seed=[seed, i])
+                    writer.write_table(pa.Table.from_pandas(cells, schema=DETAIL_SCHEMA, preserve_index=False))
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return target
+
+
+def load(manifest=None, cache_dir=CACHE_DIR):
+    cache_dir = Path(cache_dir)
+    manifest = read_manifest(cache_dir) if manifest is None else manifest
+    tables = [pq.read_table(cache_dir / entry['partition'], memory_map=True)
+              for _, entry in sorted(manifest.items())]
+    if not tables:
+        return compact(pd.DataFrame(columns=['Country', 'Year', 'Indicator', 'Gender', 'Value']))
+
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    # Later files override earlier ones for the same cell
+    return df.drop_duplicates(['Country', 'Year', 'Indicator', 'Gender'], keep='last').reset_index(drop=True)
+
+
+def detail_paths(manifest=None, cache_dir=CACHE_DIR):
+    # Detail partitions in the same order load() reads the national ones
+    cache_dir = Path(cache_dir)
+    manifest = read_manifest(cache_dir) if manifest is None else manifest
+    return [detail_target(cache_dir / entry['partition'])
+            for _, entry in sorted(manifest.items()) if entry.get('detail_rows')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize raw CSV exports into the Parquet cache")
+    parser.add_argument('--raw-dir', default=RAW_DIR, type=Path)
+    parser.add_argument('--cache-dir', default=CACHE_DIR, type=Path)
+    parser.add_argument('--force', action='store_true', help="rebuild every partition")
+    args = parser.parse_args()
+
+    manifest = refresh(args.raw_dir, args.cache_dir, force=args.force)
+    for name, entry in manifest.items():
+        detail = f", {entry['detail_rows']} breakdown rows" if entry['detail_rows'] else ''
+        print(f"{name}: {entry['rows']} rows{detail} -> {entry['partition']}")
+
+
+if __name__ == '__main__':
+    main()
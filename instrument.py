@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STAGES = ['data_load', 'filter', 'aggregate', 'query', 'figure_build', 'plotly_chart']
+QUANTILES = [0.5, 0.9, 0.99]
+WINDOW = 1000
+# Local only unless DIWA_METRICS_HOST says otherwise, e.g. 0.0.0.0 for a remote scraper
+METRICS_HOST = os.environ.get('DIWA_METRICS_HOST', '127.0.0.1')
+
+# Record every rerun, not just sessions with the debug panel open
+ALWAYS_ON = os.environ.get('DIWA_PROFILE') == '1' or bool(os.environ.get('DIWA_METRICS_PORT'))
+
+# Streamlit runs each session's script on its own thread, so the record for
+# the rerun in progress is thread-local. No record means timing is off and
+# stage() hands back a shared no-op context manager.
+_local = threading.local()
+_lock = threading.Lock()
+_windows = defaultdict(lambda: deque(maxlen=WINDOW))
+_totals = defaultdict(lambda: [0, 0.0])
+_NOOP = nullcontext()
+
+
+class _Stage:
+    __slots__ = ('record', 'name', 'start')
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.record[self.name] = self.record.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+def stage(name):
+    record = getattr(_local, 'record', None)
+    if record is None:
+        return _NOOP
+    return _Stage(record, name)
+
+
+def timed(name):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def begin_rerun(enabled=False):
+    _local.record = {} if enabled or ALWAYS_ON else None
+    _local.start = time.perf_counter()
+    _local.full = True
+
+
+def end_rerun():
+    # Close the current rerun and fold its timings into the rolling stats
+    record = getattr(_local, 'record', None)
+    _local.record = None
+    _local.full = False
+    if record is None:
+        return None
+    record['rerun'] = time.perf_counter() - _local.start
+    with _lock:
+        for name, seconds in record.items():
+            _windows[name].append(seconds)
+            _totals[name][0] += 1
+            _totals[name][1] += seconds
+    return record
+
+
+def in_full_rerun():
+    # False while Streamlit reruns a single fragment without the entrypoint
+    return getattr(_local, 'full', False)
+
+
+def _quantile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def percentiles():
+    # {stage: {'count': n, 0.5: s, 0.9: s, 0.99: s}} over the rolling window
+    with _lock:
+        windows = {name: sorted(values) for name, values in _windows.items()}
+        counts = {name: total[0] for name, total in _totals.items()}
+    return {name: {'count': counts[name], **{q: _quantile(values, q) for q in QUANTILES}}
+            for name, values in windows.items() if values}
+
+
+def prometheus_text():
+    with _lock:
+        windows = {name: sorted(values) for name, values in _windows.items()}
+        totals = {name: list(total) for name, total in _totals.items()}
+
+    lines = ['# HELP diwa_stage_seconds Time spent per rerun stage.',
+             '# TYPE diwa_stage_seconds summary']
+    for name in sorted(windows):
+        if not windows[name]:
+            continue
+        for q in QUANTILES:
+            lines.append(f'diwa_stage_seconds{{stage="{name}",quantile="{q}"}} {_quantile(windows[name], q):.6f}')
+        lines.append(f'diwa_stage_seconds_sum{{stage="{name}"}} {totals[name][1]:.6f}')
+        lines.append(f'diwa_stage_seconds_count{{stage="{name}"}} {totals[name][0]}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port, host=METRICS_HOST):
+    # Serve prometheus_text() at /metrics on a daemon thread
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,143 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+
+from aggregates import AggregateStore
+from cube import DataCube
+from export import ExportService
+from figures import FigureCache, RadarTraces
+from forecast import Forecasts
+from gaps import GapAnalytics
+from geo import GeometryStore
+from instrument import in_full_rerun, timed
+from publish import MANIFEST_NAME, REPORTS_DIR
+from reports import ReportService, default_workers
+from store import DataStore, load_cube, pin, pinned, release
+from summaries import CountrySummaries
+from urlstate import ViewCache
+from weights import load_weights
+
+# Precomputed cube bundled by build_stlite.py; never present in a server checkout
+SNAPSHOT_PATH = Path(__file__).parent / 'snapshot.json'
+
+# Versioned data store; reloads data/raw in the background when it changes
+@st.cache_resource
+@timed('data_load')
+def get_store():
+    if SNAPSHOT_PATH.exists():
+        store = DataStore(lambda: DataCube.from_dict(json.loads(SNAPSHOT_PATH.read_text())))
+    else:
+        import ingest  # needs pyarrow, which the browser build does not install
+
+        store = DataStore(load_cube, watch_dir=ingest.RAW_DIR)
+
+    # Entries for a replaced version can never be hit again
+    figure_cache, view_cache = get_figure_cache(), get_view_cache()
+    store.subscribe(lambda old, new: (figure_cache.purge(old), view_cache.purge(old)))
+
+    # Projections are fitted in the background for every new version
+    store.current().prefetch('forecasts', Forecasts)
+    store.subscribe(lambda old, new: store.current().prefetch('forecasts', Forecasts))
+    return store
+
+@contextmanager
+def pinned_snapshot():
+    # Pin up front, e.g. for one API request
+    pin(get_store().current())
+    try:
+        yield pinned()
+    finally:
+        release()
+
+def get_snapshot():
+    # The first read in a full rerun pins the current version, so every get_*
+    # call after it sees the same one even if the store swaps in a new one
+    # halfway through; home.py releases it after the page. Pages that read no
+    # data never load it. Fragment reruns skip home.py and take the current one.
+    snapshot = pinned()
+    if snapshot is None:
+        snapshot = get_store().current()
+        if in_full_rerun():
+            pin(snapshot)
+    return snapshot
+
+# Dense country x year x indicator x gender cube
+def get_cube():
+    return get_snapshot().cube
+
+# Precomputed sums/counts behind the Dashboard averages, population-weighted
+# when data/weights.csv (DIWA_WEIGHTS) exists
+@timed('aggregate')
+def get_aggregates():
+    return get_snapshot().derived('aggregates', lambda cube: AggregateStore(cube, load_weights(cube)))
+
+# Latest-year headline numbers for every country, behind Country Profiles and leaderboards
+@timed('aggregate')
+def get_summaries():
+    return get_snapshot().derived('summaries', CountrySummaries)
+
+# Gender gap series, trend slopes and years to parity for the whole cube
+@timed('aggregate')
+def get_gap_analytics():
+    return get_snapshot().derived('gaps', GapAnalytics)
+
+# Radar outlines per year for every country, sliced per selection
+@timed('aggregate')
+def get_radar_traces():
+    return get_snapshot().derived('radar', RadarTraces)
+
+# Province and survey breakdowns queried out of core; None in the browser
+# build and when the source data has no breakdowns
+@timed('aggregate')
+def get_query_engine():
+    if SNAPSHOT_PATH.exists():
+        return None
+    import query  # needs pyarrow, which the browser build does not install
+
+    return get_snapshot().derived('query', query.open_detail)
+
+# Projections to the SDG target year, or None while the background fit for
+# this version is still running
+def get_forecasts():
+    return get_snapshot().peek('forecasts')
+
+# Built figures shared by every session, bounded by DIWA_FIGURE_CACHE_MB
+@st.cache_resource
+@timed('data_load')
+def get_figure_cache():
+    return FigureCache(max_bytes=int(os.environ.get('DIWA_FIGURE_CACHE_MB', 64)) * 1024 * 1024)
+
+# Encoded CSV/Parquet/Excel downloads shared by every session, bounded by DIWA_EXPORT_CACHE_MB
+@st.cache_resource
+def get_export_service():
+    return ExportService(max_bytes=int(os.environ.get('DIWA_EXPORT_CACHE_MB', 256)) * 1024 * 1024)
+
+# PDF/PNG rendering pool shared by every session, sized by DIWA_REPORT_WORKERS
+@st.cache_resource
+def get_report_service():
+    return ReportService(workers=default_workers())
+
+# Manifest of reports pre-rendered by publish.py, re-read whenever the file changes
+def get_published_reports():
+    path = REPORTS_DIR / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return _read_published_manifest(str(path), path.stat().st_mtime_ns)
+
+@st.cache_data
+def _read_published_manifest(path, mtime_ns):
+    return json.loads(Path(path).read_text())
+
+# Tables and figures per canonical view key (see urlstate), shared by every session
+@st.cache_resource
+def get_view_cache():
+    return ViewCache(maxsize=int(os.environ.get('DIWA_VIEW_CACHE_ENTRIES', 512)))
+
+# Boundary polygons from data/geo, simplified per detail level on first use
+@st.cache_resource
+@timed('data_load')
+def get_geometry():
+    return GeometryStore()
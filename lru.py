@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    # Thread-safe least-recently-used map behind the app's process-wide
+    # caches, bounded by entry count (maxsize), total size (max_bytes, each
+    # value measured by sizeof) or both. A value bigger than max_bytes on its
+    # own is returned to the caller but never kept. purge() expects keys whose
+    # last element is the data version they were built from.
+
+    def __init__(self, maxsize=None, max_bytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        # The value for key, now the most recently used, or default
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        # Keep value unless key is already cached or value alone exceeds
+        # max_bytes, then evict least recently used entries down to the bounds
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while ((self.max_bytes is not None and self.bytes > self.max_bytes)
+                   or (self.maxsize is not None and len(self._entries) > self.maxsize)):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def cached(self, key, build):
+        # get(key), or build() outside the lock and put() on a miss
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def purge(self, version):
+        # Drop every entry built from a replaced data version
+        with self._lock:
+            for key in [key for key in self._entries if key[-1] == version]:
+                self.bytes -= self._entries.pop(key)[1]
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'maxsize': self.maxsize,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
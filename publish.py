@@ -0,0 +1,120 @@
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import reports
+from data import SAMPLE_SEED
+from store import load_cube
+from summaries import CountrySummaries
+
+# Served by Streamlit at app/static/reports/ (see .streamlit/config.toml)
+REPORTS_DIR = Path('static/reports')
+MANIFEST_NAME = 'manifest.json'
+FORMATS = ['csv', 'png', 'pdf']
+
+
+def slug(country):
+    return re.sub(r'[^a-z0-9]+', '-', country.lower()).strip('-')
+
+
+def read_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {'countries': {}}
+    return json.loads(path.read_text())
+
+
+def _render(report, fallback):
+    default_indicator = next(iter(report['trends']))
+    return {
+        'png': reports.render_png(reports.trend_figure(report, default_indicator), fallback),
+        'pdf': reports.render_country_pdf(report, fallback),
+    }
+
+
+def render_country(report, csv, out_dir, stem):
+    # Worker: write one country's CSV, PNG (default trend chart) and PDF.
+    # Without Chrome the charts are placeholders; returns (sizes, placeholder).
+    out_dir = Path(out_dir)
+    try:
+        charts, placeholder = _render(report, fallback=False), False
+    except reports.ChartUnavailable:
+        charts, placeholder = _render(report, fallback=True), True
+    outputs = {'csv': csv.encode(), **charts}
+    for fmt, data in outputs.items():
+        path = out_dir / f'{stem}.{fmt}'
+        tmp = path.with_suffix(f'.{fmt}.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    return {fmt: len(data) for fmt, data in outputs.items()}, placeholder
+
+
+def publish(cube, out_dir=REPORTS_DIR, workers=None, force=False):
+    # Render every country whose report inputs changed since the last run, or
+    # whose charts were placeholders, and rewrite the manifest. Returns
+    # (manifest, rendered countries).
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(out_dir)['countries']
+
+    summaries = CountrySummaries(cube)
+    entries, jobs = {}, {}
+    for country in summaries.frame.index:
+        country_data = cube.frame(countries=[country])
+        report = reports.country_report(summaries, country_data, country)
+        stem = slug(country)
+        entry = {'year': report['year'], 'hash': reports.content_hash('country', report),
+                 **{fmt: f'{stem}.{fmt}' for fmt in FORMATS}}
+        entries[country] = entry
+        unchanged = (previous.get(country, {}).get('hash') == entry['hash']
+                     and not previous[country].get('placeholder', True)  # unrecorded: re-render once
+                     and all((out_dir / entry[fmt]).exists() for fmt in FORMATS))
+        if force or not unchanged:
+            jobs[country] = (report, country_data.to_csv(index=False), str(out_dir), stem)
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {pool.submit(render_country, *args): country for country, args in jobs.items()}
+            for future in as_completed(futures):
+                entry = entries[futures[future]]
+                entry['bytes'], entry['placeholder'] = future.result()
+    for country, entry in entries.items():
+        if country not in jobs:
+            entry['bytes'], entry['placeholder'] = previous[country].get('bytes'), False
+
+    manifest = {'version': cube.version, 'generated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'countries': entries}
+    tmp = out_dir / f'{MANIFEST_NAME}.tmp'
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+    return manifest, list(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render every country's CSV, PNG and PDF report")
+    parser.add_argument('--out-dir', default=REPORTS_DIR, type=Path)
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--force', action='store_true', help="re-render unchanged countries too")
+    parser.add_argument('--seed', type=int, default=SAMPLE_SEED,
+                        help="seed for the sample data when data/raw is empty (default: the app's)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest, rendered = publish(load_cube(args.seed), args.out_dir, args.workers, args.force)
+    skipped = len(manifest['countries']) - len(rendered)
+    print(f"rendered {len(rendered)}, skipped {skipped} unchanged in {time.perf_counter() - start:.1f}s "
+          f"-> {args.out_dir / MANIFEST_NAME}")
+    placeholders = [country for country, entry in manifest['countries'].items() if entry['placeholder']]
+    if placeholders:
+        print(f"WARNING: kaleido found no Chrome, so the charts of {len(placeholders)} countries are "
+              "placeholders; install one with plotly_get_chrome and rerun to replace them", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from instrument import timed
+from lru import LRUCache
+
+# Memory DuckDB may use for one query before spilling to a temp file
+MEMORY_LIMIT = os.environ.get('DIWA_QUERY_MEMORY', '1GB')
+
+
+def duckdb_available():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class QueryEngine:
+    # Filtered, grouped means over the breakdown data (provinces, age bands,
+    # urban/rural, income quintiles) without loading it into pandas. DuckDB
+    # runs the query over the partitions when it is installed; otherwise
+    # pyarrow.dataset streams record batches with the filter pushed into the
+    # scan and reduces each batch to per-group sums and counts. Either way
+    # only the result-sized frame reaches pandas. Results are kept per engine,
+    # and an engine belongs to one data version.
+
+    def __init__(self, source, version, maxsize=256, backend=None):
+        # source: Parquet paths or an in-memory pyarrow Table
+        self.version = version
+        self._dataset = ds.dataset(source)
+        self.columns = self._dataset.schema.names
+        self.backend = backend or ('duckdb' if duckdb_available() else 'arrow')
+        self._results = LRUCache(maxsize=maxsize)
+        if self.backend == 'duckdb':
+            import duckdb
+
+            self._con = duckdb.connect(config={'memory_limit': MEMORY_LIMIT})
+            if isinstance(source, pa.Table):
+                self._con.register('detail', source)
+            else:
+                self._con.read_parquet([str(path) for path in source]).create_view('detail')
+            self._con_lock = threading.Lock()
+
+    @timed('query')
+    def query(self, filters=None, group_by=()):
+        # Mean Value and cell count per group_by combination, over the rows
+        # whose columns take one of the listed values, e.g.
+        # query({'Country': ['Laos'], 'Year': [2023]}, ['Province'])
+        filters = {column: sorted(set(values)) for column, values in (filters or {}).items()}
+        group_by = list(group_by)
+        key = (tuple((column, tuple(values)) for column, values in sorted(filters.items())), tuple(group_by))
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if any(not values for values in filters.values()):
+            result = pd.DataFrame(columns=[*group_by, 'Value', 'Cells'])
+        elif self.backend == 'duckdb':
+            result = self._query_duckdb(filters, group_by)
+        else:
+            result = self._query_arrow(filters, group_by)
+
+        self._results.put(key, result)
+        return result
+
+    def _query_duckdb(self, filters, group_by):
+        where = ' AND '.join(f'"{column}" IN ({", ".join("?" * len(values))})' for column, values in filters.items())
+        params = [value for values in filters.values() for value in values]
+        groups = ', '.join(f'"{column}"' for column in group_by)
+        sql = (f'SELECT {groups + ", " if groups else ""}avg("Value") AS "Value", count("Value") AS "Cells" '
+               f'FROM detail{" WHERE " + where if where else ""}'
+               f'{" GROUP BY " + groups + " ORDER BY " + groups if groups else ""}')
+        # One connection per engine; DuckDB parallelizes inside the query
+        with self._con_lock:
+            return self._con.execute(sql, params).df()
+
+    def _query_arrow(self, filters, group_by):
+        expression = None
+        for column, values in filters.items():
+            term = pc.field(column).isin(values)
+            expression = term if expression is None else expression & term
+
+        partials = []
+        for batch in self._dataset.to_batches(columns=[*group_by, 'Value'], filter=expression):
+            if batch.num_rows:
+                partial = pa.Table.from_batches([batch]).group_by(group_by).aggregate(
+                    [('Value', 'sum'), ('Value', 'count')])
+                partials.append(partial.to_pandas())
+        if not partials:
+            return pd.DataFrame(columns=[*group_by, 'Value', 'Cells'])
+
+        # Batches may carry different dictionaries, so combine as plain labels
+        combined = pd.concat(partials, ignore_index=True)
+        for column in group_by:
+            if isinstance(combined[column].dtype, pd.CategoricalDtype):
+                combined[column] = combined[column].astype(object)
+        if group_by:
+            combined = combined.groupby(group_by, sort=True).sum().reset_index()
+        else:
+            combined = combined.sum().to_frame().T
+        return pd.DataFrame({
+            **{column: combined[column] for column in group_by},
+            'Value': combined['Value_sum'] / combined['Value_count'],
+            'Cells': combined['Value_count'].astype('int64'),
+        })
+
+    def members(self, column, filters=None):
+        # Distinct values of one column, e.g. the provinces of a country
+        return self.query(filters, [column])[column].tolist()
+
+
+def open_detail(cube):
+    # Breakdown partitions ingested from data/raw; sample breakdowns on disk
+    # (ingest.sample_detail) when there is no source data. None when the
+    # sources carry no breakdowns.
+    import ingest
+
+    if not ingest.has_sources():
+        return QueryEngine([str(ingest.sample_detail(cube))], f'{cube.version}-sample')
+
+    manifest = ingest.read_manifest()
+    paths = ingest.detail_paths(manifest)
+    if not paths:
+        return None
+    digest = hashlib.blake2b(digest_size=8)
+    for _, entry in sorted(manifest.items()):
+        if entry.get('detail_rows'):
+            digest.update(entry['sha256'].encode())
+    return QueryEngine([str(path) for path in paths], digest.hexdigest())
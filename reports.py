@@ -0,0 +1,284 @@
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from lru import LRUCache
+
+GENDERS = ['all', 'female', 'male']
+CHART_SIZE = (1000, 500)
+PAGE_SIZE = (1240, 1754)  # A4 at 150 dpi
+DPI = 150
+MARGIN = 80
+
+
+def country_report(summaries, country_data, country):
+    # Plain-data report for one country: the headline row and latest-year
+    # table from the summary engine plus the country's trend series. What
+    # the Country Profiles page shows and what the PDF renderer lays out.
+    row = summaries.row(country)
+    table = summaries.indicators(country)
+
+    trends = {}
+    for (indicator, gender), group in country_data.groupby(['Indicator', 'Gender'], observed=True):
+        trends.setdefault(indicator, {})[gender] = [group['Year'].astype(int).tolist(),
+                                                    group['Value'].astype(float).tolist()]
+    return {
+        'country': country,
+        'year': int(row['Year']),
+        'average': float(row['Average']),
+        'gender_gap': float(row['Gender Gap']),
+        'strongest': row['Strongest'],
+        'weakest': row['Weakest'],
+        'indicators': {indicator: {gender: float(value) for gender, value in values.items() if gender in GENDERS}
+                       for indicator, values in table.dropna(how='all').to_dict('index').items()},
+        'trends': trends,
+    }
+
+
+def key_facts(report):
+    # Formatted headline figures for the page summary and the PDF; "n/a"
+    # where the data has no totals or no gender split to compute them from
+    average, gap = report['average'], report['gender_gap']
+    return {
+        'average': 'n/a' if math.isnan(average) else f'{average:.1f}%',
+        'gender_gap': 'n/a' if math.isnan(gap) else
+                      f"{abs(gap):.1f} percentage points ({'male' if gap > 0 else 'female'} advantage)",
+        'strongest': report['strongest'] or 'n/a',
+        'weakest': report['weakest'] or 'n/a',
+    }
+
+
+def content_hash(kind, payload):
+    text = payload if isinstance(payload, str) else json.dumps(payload, sort_keys=True)
+    return hashlib.blake2b(f'{kind}\n{text}'.encode(), digest_size=16).hexdigest()
+
+
+class ChartUnavailable(RuntimeError):
+    # kaleido found no Chrome to render charts with
+    pass
+
+
+# Drawing; Pillow is imported by the renderers only, so the browser build,
+# which never renders reports, does not install it
+
+def _font(size):
+    from PIL import ImageFont
+
+    return ImageFont.load_default(size=size)
+
+
+def _placeholder(figure_json, size=CHART_SIZE):
+    # Stand-in chart with the figure's title when kaleido has no Chrome
+    from PIL import Image, ImageDraw
+
+    figure = json.loads(figure_json)
+    title = ((figure.get('layout') or {}).get('title') or {}).get('text') or ''
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([10, 10, size[0] - 10, size[1] - 10], outline='#cccccc', width=2)
+    draw.text((30, 30), title, fill='#222222', font=_font(22))
+    draw.text((30, size[1] // 2), "Chart unavailable: kaleido needs Chrome, see plotly_get_chrome",
+              fill='#888888', font=_font(18))
+    return image
+
+
+def _chrome_missing(exc):
+    # plotly re-raises kaleido's ChromeNotFoundError as a bare RuntimeError
+    try:
+        from choreographer.errors import ChromeNotFoundError
+    except ImportError:
+        return False
+    return isinstance(exc, ChromeNotFoundError) or isinstance(exc.__context__, ChromeNotFoundError)
+
+
+def render_png(figure_json, fallback=False):
+    # kaleido drives a headless Chrome (install one with plotly_get_chrome).
+    # Without one this raises ChartUnavailable, or with fallback=True returns
+    # a placeholder chart; any other rendering error propagates.
+    import plotly.io as pio
+
+    try:
+        return pio.to_image(pio.from_json(figure_json), format='png', width=CHART_SIZE[0], height=CHART_SIZE[1])
+    except Exception as exc:
+        if not _chrome_missing(exc):
+            raise
+        if not fallback:
+            raise ChartUnavailable("charts need Chrome on the server, see plotly_get_chrome") from exc
+    out = io.BytesIO()
+    _placeholder(figure_json).save(out, format='PNG')
+    return out.getvalue()
+
+
+def _summary_page(report):
+    from PIL import Image, ImageDraw
+
+    page = Image.new('RGB', PAGE_SIZE, 'white')
+    draw = ImageDraw.Draw(page)
+    facts = key_facts(report)
+    draw.text((MARGIN, MARGIN), f"{report['country']} Digital Inclusion Profile", fill='#e91e63', font=_font(44))
+    draw.text((MARGIN, MARGIN + 64), f"ASEAN-DIWA country report, {report['year']}", fill='#555555', font=_font(24))
+
+    y = MARGIN + 140
+    for line in [
+        f"Average score across indicators: {facts['average']}",
+        f"Gender gap: {facts['gender_gap']}",
+        f"Strongest indicator: {facts['strongest']}",
+        f"Area for improvement: {facts['weakest']}",
+    ]:
+        draw.text((MARGIN, y), line, fill='#222222', font=_font(24))
+        y += 40
+
+    y += 40
+    columns = [MARGIN, PAGE_SIZE[0] - MARGIN - 420, PAGE_SIZE[0] - MARGIN - 280, PAGE_SIZE[0] - MARGIN - 140]
+    for x, heading in zip(columns, ['Indicator', 'All', 'Female', 'Male']):
+        draw.text((x, y), heading, fill='#222222', font=_font(22))
+    y += 36
+    draw.line([(MARGIN, y), (PAGE_SIZE[0] - MARGIN, y)], fill='#cccccc', width=2)
+    y += 12
+    for indicator, values in report['indicators'].items():
+        draw.text((columns[0], y), indicator[:40], fill='#333333', font=_font(20))
+        for x, gender in zip(columns[1:], GENDERS):
+            if gender in values and values[gender] == values[gender]:
+                draw.text((x, y), f'{values[gender]:.1f}%', fill='#333333', font=_font(20))
+        y += 32
+    return page
+
+
+def trend_figure(report, indicator):
+    # The Country Profiles gender trend chart, rebuilt from the report as JSON
+    import pandas as pd
+    import plotly.io as pio
+
+    import figures
+
+    frame = pd.DataFrame([{'Year': year, 'Value': value, 'Gender': gender}
+                          for gender, (years, values) in report['trends'][indicator].items()
+                          for year, value in zip(years, values)])
+    return pio.to_json(figures.gender_trends(frame, indicator, report['country']), validate=False)
+
+
+def render_country_pdf(report, fallback=False):
+    # Summary page, then the gender trend chart of every indicator, two per
+    # page; `fallback` as in render_png
+    from PIL import Image
+
+    charts = [Image.open(io.BytesIO(render_png(trend_figure(report, indicator), fallback))).convert('RGB')
+              for indicator in report['trends']]
+
+    pages = [_summary_page(report)]
+    width = PAGE_SIZE[0] - 2 * MARGIN
+    for i in range(0, len(charts), 2):
+        page = Image.new('RGB', PAGE_SIZE, 'white')
+        for j, chart in enumerate(charts[i:i + 2]):
+            chart = chart.resize((width, int(chart.height * width / chart.width)))
+            page.paste(chart, (MARGIN, MARGIN + j * (PAGE_SIZE[1] - 2 * MARGIN) // 2))
+        pages.append(page)
+
+    out = io.BytesIO()
+    pages[0].save(out, format='PDF', resolution=DPI, save_all=True, append_images=pages[1:])
+    return out.getvalue()
+
+
+RENDERERS = {
+    'png': (render_png, 'image/png'),
+    'pdf': (render_country_pdf, 'application/pdf'),
+}
+
+
+class ReportService:
+    # Renders reports on a process pool so script threads never block on
+    # rasterizing. Finished artifacts are kept in a byte-bounded LRU keyed by
+    # the content hash of their input; identical requests from any session
+    # share one render. workers=0 renders inline on the calling thread. A
+    # render that fails, ChartUnavailable included, is reported as 'failed'
+    # and retried by the next submit().
+
+    def __init__(self, workers=None, max_bytes=128 * 1024 * 1024):
+        self._pool = None
+        if workers != 0:
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self._artifacts = LRUCache(max_bytes=max_bytes)
+        self._jobs = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, payload):
+        key = content_hash(kind, payload)
+        with self._lock:
+            if key in self._artifacts or key in self._jobs:
+                return key
+            self._errors.pop(key, None)
+            if self._pool is not None:
+                future = self._pool.submit(RENDERERS[kind][0], payload)
+                self._jobs[key] = future
+        if self._pool is None:
+            try:
+                data = RENDERERS[kind][0](payload)
+            except Exception as exc:
+                with self._lock:
+                    self._errors[key] = exc
+            else:
+                self._store(key, data)
+        else:
+            future.add_done_callback(lambda f: self._finish(key, f))
+        return key
+
+    def _finish(self, key, future):
+        # Job to artifact (or error) in one step, so status() never reports a
+        # finished job as unknown
+        error = future.exception()
+        with self._lock:
+            self._jobs.pop(key, None)
+            if error is not None:
+                self._errors[key] = error
+            else:
+                self._add(key, future.result())
+
+    def _store(self, key, data):
+        with self._lock:
+            self._add(key, data)
+
+    def _add(self, key, data):
+        # Caller holds self._lock. An artifact bigger than the whole cache
+        # could never be downloaded, so it counts as failed
+        if len(data) > self._artifacts.max_bytes:
+            self._errors[key] = ValueError(f"report of {len(data)} bytes is bigger than the whole cache")
+        else:
+            self._artifacts.put(key, data)
+
+    def status(self, key):
+        # 'ready', 'pending', 'failed', or None when unknown or evicted
+        with self._lock:
+            if key in self._artifacts:
+                return 'ready'
+            if key in self._jobs:
+                return 'pending'
+            if key in self._errors:
+                return 'failed'
+        return None
+
+    def result(self, key):
+        return self._artifacts.get(key)
+
+    def error(self, key):
+        with self._lock:
+            return self._errors.get(key)
+
+
+def available():
+    # The browser build ships neither kaleido nor Pillow, so it offers no reports
+    return sys.platform != 'emscripten'
+
+
+def default_workers():
+    # Pyodide has no subprocesses
+    if sys.platform == 'emscripten':
+        return 0
+    workers = os.environ.get('DIWA_REPORT_WORKERS')
+    return int(workers) if workers else None
@@ -0,0 +1,154 @@
+import os
+import sys
+import threading
+import traceback
+import weakref
+from pathlib import Path
+
+from instrument import timed
+
+# Seconds between checks of the source folder; 0 turns hot reload off
+RELOAD_INTERVAL = float(os.environ.get('DIWA_RELOAD_INTERVAL', 5))
+
+# Snapshot pinned by the rerun or API request in progress on this thread
+_pinned = threading.local()
+
+
+def pinned():
+    return getattr(_pinned, 'snapshot', None)
+
+
+def pin(snapshot):
+    _pinned.snapshot = snapshot
+
+
+def release():
+    # Called after every page run, so an idle session keeps no old version alive
+    _pinned.snapshot = None
+
+
+def synthetic_scale():
+    # DIWA_SYNTHETIC_SCALE=COUNTRIESxYEARSxINDICATORS sizes the sample data for benchmarks
+    scale = os.environ.get('DIWA_SYNTHETIC_SCALE')
+    if not scale:
+        return None, None, None
+    return tuple(int(n) for n in scale.lower().split('x'))
+
+
+@timed('data_load')
+def load_cube(seed=None):
+    # Normalized exports from data/raw when present, otherwise sample data
+    # (data.SAMPLE_SEED unless seed is given). The data modules are imported
+    # here so home.py can import this module without numpy and pandas.
+    import ingest  # needs pyarrow, which the browser build does not install
+    from cube import DataCube
+    from data import SAMPLE_SEED, compact, generate_data
+
+    if ingest.has_sources():
+        return DataCube.from_frame(compact(ingest.load(ingest.refresh())))
+    return DataCube.from_frame(generate_data(*synthetic_scale(), seed=SAMPLE_SEED if seed is None else seed))
+
+
+class Snapshot:
+    # One data version and the structures derived from it (aggregates,
+    # summaries, ...), each built on first use. Dropping the snapshot drops
+    # everything derived from it.
+
+    def __init__(self, cube):
+        self.cube = cube
+        self.version = cube.version
+        self._derived = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name, build):
+        # One lock per structure, held while building, so concurrent sessions
+        # build each structure once without waiting on unrelated ones
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._derived:
+                self._derived[name] = build(self.cube)
+            return self._derived[name]
+
+    def peek(self, name):
+        # The structure if already built, without building or waiting
+        return self._derived.get(name)
+
+    def prefetch(self, name, build):
+        # Build a structure on a daemon thread so no rerun waits for it;
+        # inline in the browser build, where Pyodide has no threads
+        if sys.platform == 'emscripten':
+            self.derived(name, build)
+            return
+        threading.Thread(target=self.derived, args=(name, build), name=f'diwa-{name}', daemon=True).start()
+
+
+class DataStore:
+    # The current Snapshot plus a daemon thread that watches the source
+    # folder and loads a new snapshot in the background when files change.
+    # Switching over is a single assignment: reruns that already took the old
+    # snapshot finish on it, and it is freed once the last of them lets go.
+
+    def __init__(self, load=load_cube, watch_dir=None, interval=RELOAD_INTERVAL):
+        self._load = load
+        self.watch_dir = Path(watch_dir) if watch_dir else None
+        self.interval = interval
+        self.reloads = 0
+        self.last_error = None
+        self._listeners = []
+        self._signature = self._scan()
+        self._current = Snapshot(load())
+        self._live = weakref.WeakValueDictionary({self._current.version: self._current})
+        self._stop = threading.Event()
+        if self.watch_dir and interval > 0:
+            threading.Thread(target=self._watch, name='diwa-data-watcher', daemon=True).start()
+
+    def current(self):
+        return self._current
+
+    def subscribe(self, callback):
+        # callback(old_version, new_version), called on the watcher thread after a swap
+        self._listeners.append(callback)
+
+    def live_versions(self):
+        # Versions still referenced by the store or by a rerun in progress
+        return list(self._live.keys())
+
+    def _scan(self):
+        if not self.watch_dir or not self.watch_dir.exists():
+            return ()
+        return tuple(sorted((path.name, stat.st_mtime_ns, stat.st_size)
+                            for path in self.watch_dir.glob('*.csv')
+                            for stat in [path.stat()]))
+
+    def check(self):
+        # Load and swap in a new snapshot if the source files changed
+        signature = self._scan()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        cube = self._load()
+        old = self._current
+        if cube.version == old.version:
+            return False
+
+        snapshot = Snapshot(cube)
+        self._live[snapshot.version] = snapshot
+        self._current = snapshot
+        self.reloads += 1
+        for callback in self._listeners:
+            callback(old.version, snapshot.version)
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if self.check():
+                    self.last_error = None
+            except Exception:
+                # Keep serving the current snapshot; retry on the next change
+                self.last_error = traceback.format_exc(limit=1)
+
+    def stop(self):
+        self._stop.set()
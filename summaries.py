@@ -0,0 +1,69 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from instrument import timed
+
+
+class CountrySummaries:
+    # Latest-year country x indicator x gender table for every country,
+    # with the Country Profiles headline numbers derived from it in one
+    # vectorized pass. Pages look up a row; leaderboards sort the frame.
+
+    def __init__(self, cube):
+        self.cube = cube
+        countries = np.arange(len(cube.countries))
+        present = ~np.isnan(cube.values)
+
+        # Latest year with any value, per country (-1 when the country is empty)
+        has_year = present.any(axis=(2, 3))
+        latest = np.where(has_year.any(axis=1), len(cube.years) - 1 - np.argmax(has_year[:, ::-1], axis=1), -1)
+        self.latest_positions = latest
+        self.table = cube.values[countries, np.maximum(latest, 0)]  # (country, indicator, gender)
+        self.table[latest < 0] = np.nan
+
+        # A gender the sources do not report (e.g. a series with totals only)
+        # leaves its averages and the gap NaN
+        missing = np.full(self.table.shape[:2], np.nan, dtype=self.table.dtype)
+        genders = {gender: self.table[:, :, cube.position('Gender', gender)] if gender in cube.genders else missing
+                   for gender in ('all', 'female', 'male')}
+        overall = genders['all']
+        empty = np.isnan(overall).all(axis=1)
+        # nanmean warns on all-NaN rows, which are expected to come out NaN
+        with warnings.catch_warnings(action='ignore', category=RuntimeWarning):
+            average = np.nanmean(overall, axis=1)
+            gap = np.nanmean(genders['male'], axis=1) - np.nanmean(genders['female'], axis=1)
+        strongest = np.argmax(np.where(np.isnan(overall), -np.inf, overall), axis=1)
+        weakest = np.argmin(np.where(np.isnan(overall), np.inf, overall), axis=1)
+
+        indicators = np.asarray(cube.indicators, dtype=object)
+        self.frame = pd.DataFrame({
+            'Year': np.where(latest >= 0, np.asarray(cube.years)[np.maximum(latest, 0)], -1),
+            'Average': average,
+            'Gender Gap': gap,
+            'Strongest': np.where(empty, None, indicators[strongest]),
+            'Weakest': np.where(empty, None, indicators[weakest]),
+        }, index=pd.Index(cube.countries, name='Country'))
+        self.frame = self.frame[latest >= 0]
+
+    def row(self, country):
+        return self.frame.loc[country]
+
+    def metrics(self, country, gender):
+        # Latest-year value per indicator, NaN cells dropped; empty for a gender the data lacks
+        if gender not in self.cube.genders:
+            return pd.Series(dtype=self.table.dtype)
+        values = self.table[self.cube.position('Country', country), :, self.cube.position('Gender', gender)]
+        return pd.Series(values, index=self.cube.indicators).dropna()
+
+    def indicators(self, country):
+        # Indicator x gender table for the latest year
+        return pd.DataFrame(self.table[self.cube.position('Country', country)],
+                            index=self.cube.indicators, columns=self.cube.genders)
+
+    @timed('aggregate')
+    def leaderboard(self, column='Average', n=None, ascending=False):
+        board = self.frame.sort_values(column, ascending=ascending, na_position='last')
+        return board.head(n) if n else board
+
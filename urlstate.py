@@ -0,0 +1,74 @@
+from urllib.parse import urlencode
+
+import streamlit as st
+
+from lru import LRUCache
+
+
+class Field:
+    # One query parameter mirrored into a session_state key (usually a widget key)
+
+    def __init__(self, key, options, default=None, multi=False):
+        self.key = key
+        self.options = list(options)
+        self.multi = multi
+        if default is None:
+            default = [] if multi else self.options[0]
+        self.default = default
+
+    def encode(self, value):
+        if self.multi:
+            return ','.join(sorted(str(v) for v in value))
+        return str(value)
+
+    def decode(self, text):
+        # Match against the options' string forms so ints and labels round-trip;
+        # unknown values are dropped rather than raising
+        by_text = {str(option): option for option in self.options}
+        if self.multi:
+            return [by_text[part] for part in text.split(',') if part in by_text]
+        return by_text.get(text, self.default)
+
+
+class ViewState:
+    # Page filters <-> st.query_params. restore() seeds session_state from the
+    # URL before widgets are created; sync() writes the current values back
+    # (omitting defaults) and returns the canonical view key, which is the
+    # same for every session looking at the same view.
+
+    def __init__(self, page, fields):
+        self.page = page
+        self.fields = fields
+
+    def restore(self):
+        for name, field in self.fields.items():
+            if field.key in st.session_state:
+                continue
+            text = st.query_params.get(name)
+            st.session_state[field.key] = field.default if text is None else field.decode(text)
+
+    def values(self):
+        return {name: st.session_state.get(field.key, field.default) for name, field in self.fields.items()}
+
+    def sync(self):
+        encoded = {name: self.fields[name].encode(value) for name, value in self.values().items()}
+        for name, field in self.fields.items():
+            text = encoded[name]
+            if text == field.encode(field.default):
+                if name in st.query_params:
+                    del st.query_params[name]
+            elif st.query_params.get(name) != text:
+                st.query_params[name] = text
+        return f'{self.page}?{urlencode(sorted(encoded.items()))}'
+
+
+class ViewCache(LRUCache):
+    # Process-wide LRU of tables and figures computed for a view, keyed by
+    # (canonical view key, item name, data version). New sessions opening a
+    # popular view, e.g. the default Dashboard, find it already built.
+
+    def __init__(self, maxsize=512):
+        super().__init__(maxsize=maxsize)
+
+    def cached(self, view_key, name, version, build):
+        return super().cached((view_key, name, version), build)
@@ -1,7 +1,14 @@
+from functools import wraps
+
 import streamlit as st
 import plotly.express as px
+import plotly.io as pio
 import pandas as pd
 
+import export
+import instrument
+import reports
+
 def load_map():
     df = pd.read_csv("data/summary.csv")
     return px.scatter_geo(df, locations="iso_alpha", hover_name="country", size="score")
@@ -17,6 +24,99 @@ def country_card(name, flag_url, score, page_path):
     if st.button(f"View {name}"):
         st.switch_page(page_path)
 
-def download_buttons(country_name):
-    file_format = st.radio("Choose format", ["PDF", "PNG"])
-    st.download_button(f"Download {country_name} Data", b"", file_name=f"{country_name.lower()}_data.{file_format.lower()}")
\ No newline at end of file
+def download_buttons(service, country_name, report, figure, version):
+    file_format = st.radio("Choose format", ["PDF", "PNG"], horizontal=True, key="report_format")
+    if file_format == "PDF":
+        report_download(service, 'pdf', lambda: report, f"{country_name.lower()}_report.pdf",
+                        f"📄 Download {country_name} PDF Report", widget_key="country_pdf",
+                        ident=(country_name, version))
+    else:
+        report_download(service, 'png', lambda: pio.to_json(figure, validate=False),
+                        f"{country_name.lower()}_chart.png", "🖼️ Download PNG Chart",
+                        widget_key="country_png", ident=(figure.layout.title.text, version))
+
+def report_download(service, kind, payload, file_name, label, widget_key, ident):
+    # Render on the report pool after one click, then poll from a fragment
+    # until the artifact is ready; the page stays usable meanwhile. `ident`
+    # identifies the current content so a changed view asks again.
+    job = st.session_state.get(widget_key)
+    if job is None or job[0] != ident or service.status(job[1]) is None:
+        if not st.button(label, key=f"{widget_key}_render"):
+            return
+        job = st.session_state[widget_key] = (ident, service.submit(kind, payload()))
+
+    key = job[1]
+    mime = reports.RENDERERS[kind][1]
+
+    polling = service.status(key) == 'pending'
+
+    def poll():
+        status = service.status(key)
+        if polling and status != 'pending':
+            st.rerun()  # redraw the page without the polling timer
+        if status == 'ready':
+            data = service.result(key)
+            st.download_button(f"{label} ({export.format_size(len(data))})", data,
+                               file_name=file_name, mime=mime,
+                               on_click="ignore", key=f"{widget_key}_download")
+        elif status == 'failed':
+            st.error(f"Rendering failed: {service.error(key)}")
+        else:
+            st.caption(f"⏳ Rendering {file_name}...")
+
+    st.fragment(poll, run_every=1 if polling else None)()
+
+def export_buttons(service, frame, key, file_stem, label="📥 Download Data", widget_key="export"):
+    # Format picker plus a single download button. Encoded files come from the
+    # shared export cache; views estimated above the inline limit are built on request.
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox("Format", export.available_formats(), key=f"{widget_key}_format",
+                           label_visibility="collapsed")
+    ext, mime = export.FORMATS[fmt]
+
+    data = service.get(key, fmt)
+    with col2:
+        if data is None:
+            estimate = service.estimate(key, fmt, frame)
+            if estimate > export.INLINE_BYTES and not st.button(
+                    f"⚙️ Prepare {fmt} (≈{export.format_size(estimate)})", key=f"{widget_key}_prepare"):
+                return
+            data = service.export(key, fmt, frame)
+        st.download_button(f"{label} ({fmt}, {export.format_size(len(data))})", data,
+                           file_name=f"{file_stem}.{ext}", mime=mime, on_click="ignore", key=widget_key)
+
+def fragment(func):
+    # st.fragment that counts reruns of just the fragment in session_state
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not instrument.in_full_rerun():
+            st.session_state.fragment_reruns = st.session_state.get('fragment_reruns', 0) + 1
+        return func(*args, **kwargs)
+    return st.fragment(wrapper)
+
+def debug_panel(timings, store):
+    with st.sidebar.expander("⏱️ Rerun timings", expanded=True):
+        st.caption(f"Data version {store.current().version}, {store.reloads} reloads, "
+                   f"live snapshots: {', '.join(store.live_versions())}")
+        if store.last_error:
+            st.caption(f"Last reload failed: {store.last_error}")
+        st.caption(f"Reruns this session: {st.session_state.get('full_reruns', 0)} full, "
+                   f"{st.session_state.get('fragment_reruns', 0)} fragment")
+        if timings:
+            st.caption("This rerun (ms)")
+            st.dataframe(pd.DataFrame({'Stage': list(timings),
+                                       'ms': [seconds * 1000 for seconds in timings.values()]}),
+                         hide_index=True, use_container_width=True)
+
+        stats = instrument.percentiles()
+        if stats:
+            st.caption("Rolling percentiles, all sessions (ms)")
+            st.dataframe(pd.DataFrame([
+                {'Stage': name, 'n': row['count'],
+                 **{f'p{int(q * 100)}': row[q] * 1000 for q in instrument.QUANTILES}}
+                for name, row in sorted(stats.items())
+            ]), hide_index=True, use_container_width=True)
+
+        st.caption("Prometheus")
+        st.code(instrument.prometheus_text(), language='text')
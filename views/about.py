@@ -0,0 +1,88 @@
+import streamlit as st
+
+st.title("ℹ️ About ASEAN-DIWA")
+
+st.markdown("""
+## 🌟 Mission
+
+The ASEAN Digital Inclusion for Women Alliance (DIWA) is dedicated to bridging the digital gender gap 
+across Southeast Asia through data-driven insights, collaborative partnerships, and targeted interventions.
+
+## 🎯 Objectives
+
+- **Data Collection & Analysis**: Comprehensive monitoring of digital inclusion indicators
+- **Policy Support**: Evidence-based recommendations for inclusive digital policies  
+- **Capacity Building**: Training and resources for stakeholders
+- **Regional Collaboration**: Facilitating knowledge sharing across ASEAN countries
+
+## 📊 Key Indicators
+
+Our dashboard tracks six critical indicators of digital inclusion:
+
+1. **Internet Usage**: Percentage of population using the internet
+2. **Mobile Phone Ownership**: Access to mobile communication technology
+3. **Digital Literacy**: Skills and knowledge for effective digital participation
+4. **ICT Employment**: Participation in information and communication technology sectors
+5. **Online Shopping**: Engagement in digital commerce activities
+6. **Digital Banking**: Access and usage of digital financial services
+
+## 🌍 Geographic Coverage
+
+- **ASEAN Member States**: Brunei, Cambodia, Indonesia, Laos, Malaysia, Myanmar, Philippines, Singapore, Thailand, Vietnam
+- **Partner Countries**: Papua New Guinea, Timor-Leste
+
+## 📈 Data Sources
+
+*Note: This dashboard currently displays generated sample data for demonstration purposes. 
+In production, data would be sourced from:*
+
+- National statistical offices
+- ITU World Telecommunication/ICT Indicators Database
+- World Bank Development Indicators
+- GSMA Mobile Connectivity Index
+- Regional surveys and studies
+
+## 🤝 Partners
+
+ASEAN-DIWA collaborates with various organizations including:
+
+- ASEAN Secretariat
+- UN Women
+- International Telecommunication Union (ITU)
+- World Bank
+- National governments and statistical offices
+- Civil society organizations
+
+## 📞 Contact
+
+For more information about ASEAN-DIWA:
+
+- Email: info@asean-diwa.org
+- Website: www.asean-diwa.org
+- Follow us on social media for updates
+
+---
+
+*This dashboard was developed to support evidence-based decision making for digital inclusion initiatives across the ASEAN region.*
+""")
+
+# Technical information
+with st.expander("🔧 Technical Information"):
+    st.markdown("""
+    **Dashboard Features:**
+    - Interactive visualizations with Plotly
+    - Multi-page navigation with persistent state
+    - Data filtering and export capabilities
+    - Responsive design for various screen sizes
+    - Download functionality for reports and data
+    
+    **Built with:**
+    - Streamlit for the web framework
+    - Pandas for data manipulation
+    - Plotly for interactive charts
+    - NumPy for data generation
+    
+    **Browser Compatibility:**
+    - Chrome, Firefox, Safari, Edge (latest versions)
+    - Mobile-responsive design
+    """)
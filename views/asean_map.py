@@ -0,0 +1,127 @@
+import streamlit as st
+
+import figures
+import geo
+from instrument import stage
+from loaders import get_cube, get_figure_cache, get_geometry, get_query_engine, get_view_cache
+from urlstate import Field, ViewState
+from utils import fragment
+
+cube = get_cube()
+figure_cache = get_figure_cache()
+geometry = get_geometry()
+view_cache = get_view_cache()
+engine = get_query_engine()
+drill_countries = engine.members('Country') if engine is not None else []
+
+# Filters mirrored in the URL
+fields = {
+    'indicator': Field('map_indicator', cube.indicators),
+    'year': Field('map_year', sorted(cube.years, reverse=True)),
+    'gender': Field('map_gender', ['all', 'female', 'male']),
+}
+if geometry.has_layer('countries'):
+    fields['detail'] = Field('map_detail', geo.LEVELS, default='medium')
+if drill_countries:
+    fields['drill'] = Field('map_drill', drill_countries)
+view_state = ViewState('asean_map', fields)
+view_state.restore()
+view_key = view_state.sync()
+
+st.title("🗺️ ASEAN Interactive Map")
+st.markdown("Explore digital inclusion indicators across ASEAN countries")
+
+# Map controls
+col1, col2, col3 = st.columns(3)
+with col1:
+    map_indicator = st.selectbox("Select Indicator for Map:", cube.indicators, key='map_indicator')
+with col2:
+    map_year = st.selectbox("Select Year:", sorted(cube.years, reverse=True), key='map_year')
+with col3:
+    map_gender = st.selectbox("View by Gender:", ['all', 'female', 'male'], key='map_gender')
+
+# Prepare map data
+map_data = view_cache.cached(
+    view_key, 'map_data', cube.version,
+    lambda: cube.frame(indicators=[map_indicator], years=[map_year], genders=[map_gender]))
+
+# Polygon choropleth joined on ISO3 codes, from data/geo/countries.geojson
+# when present and Plotly's built-in country outlines otherwise
+geo_data = geo.join_country_ids(map_data)
+if geometry.has_layer('countries'):
+    detail = st.select_slider("Boundary detail:", options=list(geo.LEVELS), key='map_detail')
+    fig = figure_cache.cached(
+        'country_choropleth', (map_indicator, map_gender, map_year, detail), cube.version,
+        lambda: figures.country_choropleth(geo_data, geometry.geojson('countries', detail),
+                                           map_indicator, map_gender, map_year))
+else:
+    fig = figure_cache.cached(
+        'country_choropleth', (map_indicator, map_gender, map_year, None), cube.version,
+        lambda: figures.country_choropleth(geo_data, None, map_indicator, map_gender, map_year))
+
+with stage('plotly_chart'):
+    st.plotly_chart(fig, use_container_width=True)
+
+# Province drill-down with the same filters, answered by the query engine
+if drill_countries:
+    st.subheader("🔎 Province Drill-down")
+    drill_country = st.selectbox("Select Country:", drill_countries, key='map_drill')
+    provinces = engine.query({'Country': [drill_country], 'Indicator': [map_indicator],
+                              'Year': [map_year], 'Gender': [map_gender]}, ['Province'])
+    title = f'{map_indicator} by Province - {drill_country}, {map_gender.title()} ({map_year})'
+    province_ids = geometry.ids_by_name('provinces') if geometry.has_layer('provinces') else {}
+    geo_data = provinces.assign(id=provinces['Province'].map(province_ids)).dropna(subset=['id'])
+
+    if provinces.empty:
+        st.info(f"No province data for {drill_country} in {map_year}.")
+    elif not geo_data.empty:
+        # Polygons from data/geo/provinces.geojson, matched on province names
+        detail = st.session_state.get('map_detail', 'medium')
+        def province_figure():
+            geojson = geometry.geojson('provinces', detail)
+            ids = set(geo_data['id'])
+            subset = {'type': 'FeatureCollection', 'features': [f for f in geojson['features'] if f['id'] in ids]}
+            return figures.province_choropleth(geo_data, subset, map_indicator, title)
+        fig = figure_cache.cached(
+            'province_choropleth', (drill_country, map_indicator, map_gender, map_year, detail), engine.version,
+            province_figure)
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        fig = figure_cache.cached(
+            'province_bar', (drill_country, map_indicator, map_gender, map_year), engine.version,
+            lambda: figures.breakdown_bar(provinces, 'Province', map_indicator, title))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+
+# Country comparison section
+st.subheader("🔄 Quick Country Comparison")
+
+@fragment
+def quick_comparison(map_data):
+    # Picking countries reruns only this section, not the map
+    col1, col2 = st.columns(2)
+    with col1:
+        country1 = st.selectbox("Select First Country:", map_data['Country'].unique())
+    with col2:
+        country2 = st.selectbox("Select Second Country:", 
+                               [c for c in map_data['Country'].unique() if c != country1])
+
+    if country1 and country2:
+        comp_data = map_data[map_data['Country'].isin([country1, country2])]
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            val1 = comp_data[comp_data['Country'] == country1]['Value'].iloc[0]
+            st.metric(country1, f"{val1:.1f}%")
+        
+        with col2:
+            val2 = comp_data[comp_data['Country'] == country2]['Value'].iloc[0]
+            diff = val2 - val1
+            st.metric(country2, f"{val2:.1f}%", f"{diff:+.1f}%")
+        
+        with col3:
+            st.markdown(f"**Gap:** {abs(diff):.1f} percentage points")
+
+quick_comparison(map_data)
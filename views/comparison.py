@@ -0,0 +1,114 @@
+import plotly.io as pio
+import streamlit as st
+
+import figures
+import reports
+from instrument import stage
+from loaders import (get_cube, get_export_service, get_figure_cache, get_radar_traces, get_report_service,
+                     get_view_cache)
+from urlstate import Field, ViewState
+from utils import export_buttons, report_download
+
+cube = get_cube()
+figure_cache = get_figure_cache()
+view_cache = get_view_cache()
+
+# Controls mirrored in the URL
+view_state = ViewState('comparison', {
+    'indicator': Field('comp_indicator', cube.indicators),
+    'year': Field('comp_year', sorted(cube.years, reverse=True)),
+    'countries': Field('comp_countries', cube.countries, default=cube.countries[:5], multi=True),
+    'chart': Field('chart_type', ["Bar Chart", "Line Chart", "Radar Chart"]),
+    'radar': Field('radar_mode', ["Selected countries", "Top N + ASEAN average"]),
+})
+view_state.restore()
+view_key = view_state.sync()
+
+st.title("📈 Country Comparison")
+st.markdown("Compare digital inclusion indicators across countries")
+
+# Comparison controls
+col1, col2 = st.columns(2)
+
+with col1:
+    comp_indicator = st.selectbox("Select Indicator:", cube.indicators, key='comp_indicator')
+    comp_year = st.selectbox("Select Year:", sorted(cube.years, reverse=True), key='comp_year')
+
+with col2:
+    comp_countries = st.multiselect("Select Countries to Compare:", 
+                                   cube.countries,
+                                   key='comp_countries')
+    chart_type = st.selectbox("Chart Type:", ["Bar Chart", "Line Chart", "Radar Chart"], key='chart_type')
+
+if comp_countries:
+    # Filter data
+    comp_data = view_cache.cached(
+        view_key, 'comp_data', cube.version,
+        lambda: cube.frame(countries=comp_countries, years=[comp_year], indicators=[comp_indicator]))
+    
+    # Create visualizations
+    if chart_type == "Bar Chart":
+        fig = figure_cache.cached(
+            'comparison_bar', (comp_indicator, comp_year, comp_countries), cube.version,
+            lambda: figures.comparison_bar(comp_data, comp_indicator, comp_year))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    elif chart_type == "Line Chart":
+        # Show trends for selected countries
+        trend_data = cube.frame(countries=comp_countries, indicators=[comp_indicator],
+                                genders=['all'])  # Show all gender for clarity
+        
+        fig = figure_cache.cached(
+            'comparison_trends', (comp_indicator, comp_countries), cube.version,
+            lambda: figures.comparison_trends(trend_data, comp_indicator))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    elif chart_type == "Radar Chart":
+        # Create radar chart for all indicators
+        radar_mode = st.radio("Radar Mode:", ["Selected countries", "Top N + ASEAN average"],
+                              horizontal=True, key="radar_mode")
+        top_n = None
+        if radar_mode == "Top N + ASEAN average":
+            top_n = 1
+            if len(comp_countries) > 1:
+                top_n = st.slider("Top N countries:", 1, min(len(comp_countries), 20),
+                                  min(len(comp_countries), 5), key="radar_top_n")
+
+        radar_traces = get_radar_traces()
+        fig = figure_cache.cached(
+            'radar', (comp_year, comp_countries, top_n), cube.version,
+            lambda: figures.radar(*radar_traces.select(comp_year, comp_countries, top_n),
+                                  cube.indicators, comp_year))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    # Rankings
+    st.subheader("🏆 Rankings")
+    
+    ranking_data = comp_data[comp_data['Gender'] == 'all'].sort_values('Value', ascending=False)
+    ranking_data['Rank'] = range(1, len(ranking_data) + 1)
+    
+    st.dataframe(
+        ranking_data[['Rank', 'Country', 'Value']].rename(columns={'Value': f'{comp_indicator} (%)'}),
+        use_container_width=True
+    )
+    
+    # Download options
+    st.subheader("📥 Download Options")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        export_buttons(
+            get_export_service(), comp_data, (view_key, cube.version),
+            f'comparison_{comp_indicator}_{comp_year}',
+            label="📊 Download Comparison Data", widget_key="comparison_download")
+    
+    if reports.available():
+        with col2:
+            report_download(
+                get_report_service(), 'png', lambda: pio.to_json(fig, validate=False),
+                f'comparison_{comp_indicator}_{comp_year}.png', "📈 Download Chart",
+                widget_key="comparison_chart",
+                ident=(chart_type, comp_indicator, comp_year, tuple(sorted(comp_countries)), cube.version))
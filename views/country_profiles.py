@@ -0,0 +1,171 @@
+import streamlit as st
+
+import figures
+import reports
+from data import BREAKDOWNS
+from instrument import stage
+from loaders import (get_cube, get_export_service, get_figure_cache, get_forecasts, get_query_engine,
+                     get_report_service, get_summaries)
+from urlstate import Field, ViewState
+from utils import download_buttons, export_buttons, fragment
+
+cube = get_cube()
+figure_cache = get_figure_cache()
+summaries = get_summaries()
+
+st.title("📊 Country Profiles")
+st.markdown("Detailed analysis for each ASEAN country")
+
+# Country selection
+countries = sorted(cube.countries)
+
+# Selection persists in session state and is mirrored in the URL
+view_state = ViewState('country_profiles', {
+    'country': Field('selected_country', countries),
+    'trend': Field('trend_indicator', cube.indicators),
+})
+view_state.restore()
+view_state.sync()
+
+def select_country(country):
+    # Runs before the rerun, so the page renders the new country in one pass
+    st.session_state.selected_country = country
+
+# Create country grid
+cols = st.columns(4)
+
+for i, country in enumerate(countries):
+    with cols[i % 4]:
+        st.button(f"🏴 {country}", key=f"country_{i}", use_container_width=True,
+                  on_click=select_country, args=(country,))
+
+country = st.session_state.selected_country
+
+st.markdown(f"## 📍 {country} Profile")
+
+# Country overview
+country_data = cube.frame(countries=[country])
+report = reports.country_report(summaries, country_data, country)
+latest_year = report['year']
+
+# Overview metrics
+st.subheader("📊 Key Indicators Overview")
+
+gender_tabs = st.tabs(["👥 All", "👩 Female", "👨 Male"])
+
+for i, gender in enumerate(['all', 'female', 'male']):
+    with gender_tabs[i]:
+        metrics = summaries.metrics(country, gender)
+        
+        cols = st.columns(3)
+        for j, (indicator, value) in enumerate(metrics.items()):
+            with cols[j % 3]:
+                st.metric(indicator, f"{value:.1f}%")
+
+# Trends analysis
+st.subheader("📈 Trends Over Time")
+
+forecasts = get_forecasts()
+if forecasts is not None and not forecasts.years:
+    forecasts = None  # the data already reaches the target year
+
+def trend_figure(indicator):
+    trend_data = country_data[country_data['Indicator'] == indicator]
+
+    def build():
+        fig = figures.gender_trends(trend_data, indicator, country)
+        if forecasts is not None:
+            figures.add_projection(fig, trend_data,
+                                   forecasts.frame(countries=[country], indicators=[indicator]), 'Gender')
+        return fig
+    return figure_cache.cached('gender_trends', (indicator, country, forecasts is not None), cube.version, build)
+
+@fragment
+def trend_section():
+    # Changing the indicator reruns only this section
+    trend_indicator = st.selectbox("Select Indicator for Trends:", 
+                                  country_data['Indicator'].unique(),
+                                  key="trend_indicator")
+    view_state.sync()
+    with stage('plotly_chart'):
+        st.plotly_chart(trend_figure(trend_indicator), use_container_width=True)
+    if forecasts is not None:
+        st.caption(f"Dashed lines: projections to {forecasts.years[-1]} with 95% prediction intervals.")
+
+trend_section()
+
+# Sub-national drill-down, answered by the query engine
+engine = get_query_engine()
+if engine is not None and country in engine.members('Country'):
+    st.subheader("🏘️ Provinces and Breakdowns")
+
+    @fragment
+    def breakdown_section():
+        # Changing these reruns only this section
+        detail_filters = {'Country': [country]}
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            indicator = st.selectbox("Indicator:", engine.members('Indicator', detail_filters),
+                                     key='breakdown_indicator')
+        with col2:
+            year = st.selectbox("Year:", sorted(engine.members('Year', detail_filters), reverse=True),
+                                key='breakdown_year')
+        with col3:
+            gender = st.selectbox("Gender:", engine.members('Gender', detail_filters), key='breakdown_gender')
+
+        col1, col2 = st.columns(2)
+        with col1:
+            province = st.selectbox("Province:", ['All provinces'] + engine.members('Province', detail_filters),
+                                    key='breakdown_province')
+        with col2:
+            breakdown = st.selectbox("Break down by:", BREAKDOWNS, key='breakdown_by')
+
+        filters = {**detail_filters, 'Indicator': [indicator], 'Year': [year], 'Gender': [gender]}
+        if province != 'All provinces':
+            filters['Province'] = [province]
+        table = engine.query(filters, [breakdown])
+        place = country if province == 'All provinces' else f'{province}, {country}'
+        fig = figure_cache.cached(
+            'breakdown_bar', (place, indicator, year, gender, breakdown), engine.version,
+            lambda: figures.breakdown_bar(table, breakdown, indicator,
+                                          f'{indicator} by {breakdown} - {place}, {gender.title()} ({year})'))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(table, hide_index=True, use_container_width=True,
+                     column_config={'Value': st.column_config.NumberColumn(format="%.1f%%")})
+
+    breakdown_section()
+
+# Country summary
+st.subheader("📝 Country Summary")
+
+# Generate summary based on data
+facts = reports.key_facts(report)
+
+summary_text = f"""
+**{country}** shows an average digital inclusion score of **{facts['average']}** across all indicators in {latest_year}.
+
+**Key Insights:**
+- Gender Gap: {facts['gender_gap']}
+- Strongest Indicator: {facts['strongest']}
+- Area for Improvement: {facts['weakest']}
+
+**Recommendations:**
+- Focus on closing gender gaps in digital access and skills
+- Strengthen digital infrastructure and affordability
+- Promote inclusive digital policies and programs
+"""
+
+st.markdown(summary_text)
+
+# Download section; not in the browser build, which cannot render reports
+if reports.available():
+    st.subheader("📥 Download Report")
+
+    download_buttons(get_report_service(), country, report, trend_figure(st.session_state.trend_indicator),
+                     cube.version)
+
+# Raw data download
+export_buttons(get_export_service(), country_data, ('country', country, cube.version),
+               f'{country}_digital_inclusion_data',
+               label="📊 Download Raw Data", widget_key="country_data_download")
@@ -0,0 +1,246 @@
+import pandas as pd
+import streamlit as st
+
+import figures
+from instrument import stage
+from loaders import (get_aggregates, get_cube, get_export_service, get_figure_cache, get_forecasts,
+                     get_published_reports, get_summaries, get_view_cache)
+from urlstate import Field, ViewState
+from utils import export_buttons
+
+cube = get_cube()
+aggregates = get_aggregates()
+figure_cache = get_figure_cache()
+view_cache = get_view_cache()
+
+WEIGHTINGS = ['Population-weighted', 'Unweighted']
+
+# Filters mirrored in the URL; view_key names this exact view for every session
+fields = {
+    'year': Field('dashboard_year', sorted(cube.years, reverse=True)),
+    'gender': Field('dashboard_gender', ['all', 'female', 'male']),
+    'countries': Field('dashboard_countries', cube.countries, default=cube.countries[:6], multi=True),
+    'indicator': Field('dashboard_indicator', cube.indicators),
+}
+if aggregates.weighted:
+    fields['weighting'] = Field('dashboard_weighting', WEIGHTINGS)
+view_state = ViewState('dashboard', fields)
+view_state.restore()
+view_key = view_state.sync()
+
+# Card styles used only on this page
+st.markdown("""
+<style>
+    .main-header {
+        background: linear-gradient(135deg, #e91e63 0%, #ad1457 100%);
+        padding: 2rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 4px 8px rgba(233, 30, 99, 0.3);
+    }
+    .metric-card {
+        background: white;
+        padding: 1rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(233, 30, 99, 0.1);
+        text-align: center;
+        border-top: 3px solid #e91e63;
+    }
+    .indicator-section {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin-bottom: 1rem;
+        box-shadow: 0 2px 4px rgba(233, 30, 99, 0.05);
+        border-left: 4px solid #f8bbd9;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+st.markdown("""
+<div class="main-header">
+    <h1>ASEAN Digital Inclusion for Women Alliance (DIWA)</h1>
+    <p>Bridging the Digital Gender Gap in Southeast Asia</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Project Brief
+with st.expander("📋 Project Brief", expanded=True):
+    st.markdown("""
+    **ASEAN-DIWA** is a comprehensive initiative aimed at promoting digital inclusion and reducing 
+    the digital gender gap across ASEAN member states and partner countries. Our mission is to:
+    
+    - 📊 **Monitor** digital gender disparities through data-driven insights
+    - 🎯 **Identify** key areas requiring targeted interventions
+    - 🤝 **Collaborate** with stakeholders to implement inclusive digital policies
+    - 📈 **Track** progress towards achieving digital equality
+    
+    This dashboard provides interactive visualizations and country-specific analysis to support 
+    evidence-based decision making for digital inclusion initiatives.
+    """)
+
+# Key Metrics Overview
+st.subheader("📊 Key Indicators Overview")
+
+# Filter controls
+col1, col2, col3 = st.columns(3)
+with col1:
+    selected_year = st.selectbox("Select Year:", sorted(cube.years, reverse=True), key='dashboard_year')
+with col2:
+    selected_gender = st.selectbox("View by Gender:", ['all', 'female', 'male'], key='dashboard_gender')
+with col3:
+    selected_countries = st.multiselect("Select Countries:", 
+                                      options=cube.countries,
+                                      key='dashboard_countries')
+
+# Filter data
+filtered_data = view_cache.cached(
+    view_key, 'filtered', cube.version,
+    lambda: cube.frame(countries=selected_countries, years=[selected_year], genders=[selected_gender]))
+if aggregates.weighted:
+    weighting = st.radio("Regional average:", WEIGHTINGS, horizontal=True, key='dashboard_weighting')
+else:
+    weighting = WEIGHTINGS[1]
+summary = aggregates.summary(selected_year, selected_gender, selected_countries,
+                             weighted=weighting == WEIGHTINGS[0])
+unweighted = [country for country, years in summary.unweighted.items() if selected_year in years]
+if unweighted:
+    st.caption(f"No {selected_year} population weight for {', '.join(unweighted)}; "
+               "left out of the weighted averages.")
+
+# Create metrics cards
+indicators = cube.indicators
+
+# Display metrics in a grid
+cols = st.columns(3)
+for i, indicator in enumerate(indicators):
+    with cols[i % 3]:
+        avg_value = summary.indicators[indicator]
+        interval = summary.intervals[indicator] if summary.intervals is not None else float('nan')
+        basis = "Population-weighted average" if summary.weighted else "Average"
+        ci = f"<br>± {interval:.1f} pp (95% CI)" if interval == interval else ""
+        
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>{indicator}</h3>
+            <h2 style="color: #e91e63;">{avg_value:.1f}%</h2>
+            <p>{basis} across selected countries{ci}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Interactive Charts
+st.subheader("📈 Interactive Visualizations")
+
+tab1, tab2, tab3 = st.tabs(["📊 By Indicator", "🌍 By Country", "📅 Trends"])
+
+with tab1:
+    selected_indicator = st.selectbox("Choose Indicator:", indicators, key='dashboard_indicator')
+    
+    chart_data = view_cache.cached(
+        view_key, 'chart_data', cube.version,
+        lambda: filtered_data[filtered_data['Indicator'] == selected_indicator])
+    
+    if not chart_data.empty:
+        fig = figure_cache.cached(
+            'indicator_bar', (selected_indicator, selected_gender, selected_year, selected_countries),
+            cube.version,
+            lambda: figures.indicator_bar(chart_data, selected_indicator, selected_gender, selected_year))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Download button
+        export_buttons(
+            get_export_service(), chart_data, (view_key, cube.version),
+            f'{selected_indicator}_{selected_year}_{selected_gender}',
+            label="📥 Download Chart Data", widget_key="chart_data_download")
+
+with tab2:
+    country_summary = summary.countries
+    
+    fig = figure_cache.cached(
+        'country_bar', (selected_year, selected_gender, selected_countries), cube.version,
+        lambda: figures.country_bar(country_summary, selected_year))
+    with stage('plotly_chart'):
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.caption("🏅 ASEAN leaderboard, latest year per country")
+    st.dataframe(
+        get_summaries().leaderboard().reset_index(),
+        column_config={'Average': st.column_config.NumberColumn(format="%.1f%%"),
+                       'Gender Gap': st.column_config.NumberColumn(format="%+.1f pp")},
+        hide_index=True, use_container_width=True)
+
+with tab3:
+    trend_data = summary.trends
+    forecasts = get_forecasts()
+    if forecasts is not None and not forecasts.years:
+        forecasts = None  # the data already reaches the target year
+
+    def trend_figure():
+        fig = figures.indicator_trends(trend_data, selected_gender)
+        if forecasts is not None:
+            population = aggregates.latest_population(selected_gender) if summary.weighted else None
+            figures.add_projection(fig, trend_data,
+                                   forecasts.regional(selected_countries, selected_gender, population), 'Indicator')
+        return fig
+    
+    fig = figure_cache.cached(
+        'indicator_trends', (selected_gender, selected_countries, summary.weighted, forecasts is not None),
+        cube.version, trend_figure)
+    with stage('plotly_chart'):
+        st.plotly_chart(fig, use_container_width=True)
+    if summary.unweighted:
+        gaps = '; '.join(f"{country} ({', '.join(map(str, years))})" for country, years in summary.unweighted.items())
+        st.caption(f"No population weight for {gaps}; left out of the weighted trend in those years.")
+    if forecasts is not None:
+        st.caption(f"Dashed lines: projections to {forecasts.years[-1]} from each country's fitted trend.")
+
+# Reports pre-rendered by publish.py, linked straight from the static folder
+published = get_published_reports()
+if published:
+    with st.expander(f"📑 Published Country Reports (generated {published['generated']})"):
+        formats = ['pdf', 'png', 'csv']
+        st.dataframe(
+            pd.DataFrame([{'Country': country, 'Year': entry['year'],
+                           **{fmt: f"app/static/reports/{entry[fmt]}" for fmt in formats}}
+                          for country, entry in published['countries'].items()]),
+            column_config={fmt: st.column_config.LinkColumn(fmt.upper(), display_text=f"Download {fmt.upper()}")
+                           for fmt in formats},
+            hide_index=True, use_container_width=True)
+
+# Navigation Guide; page links switch pages in the browser without rerunning this page
+st.subheader("🧭 Explore More")
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.markdown("""
+    <div class="indicator-section">
+        <h4>🗺️ Interactive Map</h4>
+        <p>Explore geographical patterns of digital inclusion across ASEAN countries with our interactive choropleth maps.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.page_link("views/asean_map.py", label="Visit ASEAN Map", icon="➡️")
+
+with col2:
+    st.markdown("""
+    <div class="indicator-section">
+        <h4>📊 Country Profiles</h4>
+        <p>Dive deep into individual country analysis with detailed breakdowns and downloadable reports.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.page_link("views/country_profiles.py", label="View Country Profiles", icon="➡️")
+
+with col3:
+    st.markdown("""
+    <div class="indicator-section">
+        <h4>📈 Compare Countries</h4>
+        <p>Create side-by-side comparisons between countries with customizable charts and rankings.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.page_link("views/comparison.py", label="Compare Countries", icon="➡️")
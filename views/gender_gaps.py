@@ -0,0 +1,88 @@
+import numpy as np
+import streamlit as st
+
+import figures
+from instrument import stage
+from loaders import get_cube, get_figure_cache, get_gap_analytics, get_view_cache
+from urlstate import Field, ViewState
+
+cube = get_cube()
+figure_cache = get_figure_cache()
+gaps = get_gap_analytics()
+view_cache = get_view_cache()
+
+# Controls mirrored in the URL
+view_state = ViewState('gender_gaps', {
+    'indicator': Field('gap_indicator', cube.indicators),
+    'countries': Field('gap_countries', cube.countries, default=cube.countries, multi=True),
+})
+view_state.restore()
+view_key = view_state.sync()
+
+st.title("⚖️ Gender Gap Analytics")
+st.markdown("Male minus female scores over time. Positive gaps favour men, negative gaps favour women.")
+
+# Controls
+col1, col2 = st.columns(2)
+
+with col1:
+    gap_indicator = st.selectbox("Select Indicator:", cube.indicators, key="gap_indicator")
+
+with col2:
+    gap_countries = st.multiselect("Select Countries:", cube.countries, key="gap_countries")
+
+if gap_countries:
+    gap_table = view_cache.cached(
+        view_key, 'gap_table', gaps.version,
+        lambda: gaps.table(countries=gap_countries, indicators=[gap_indicator]))
+
+    # Headline metrics
+    closing = gap_table['Closing (pp/yr)'] > 0
+    finite = np.isfinite(gap_table['Years to Parity'])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Gaps Closing", f"{int(closing.sum())} of {len(gap_table)}")
+    with col2:
+        st.metric("Largest Gap", f"{gap_table['Latest Gap'].abs().max():.1f} pp")
+    with col3:
+        median = gap_table.loc[finite, 'Years to Parity'].median()
+        st.metric("Median Years to Parity", "—" if np.isnan(median) else f"{median:.1f}")
+
+    tab1, tab2 = st.tabs(["📉 Gap Trends", "⏳ Years to Parity"])
+
+    with tab1:
+        gap_data = gaps.series(countries=gap_countries, indicators=[gap_indicator])
+        fig = figure_cache.cached(
+            'gap_trends', (gap_indicator, gap_countries), gaps.version,
+            lambda: figures.gap_trends(gap_data, gap_indicator))
+        with stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+
+    with tab2:
+        if finite.any():
+            fig = figure_cache.cached(
+                'parity_bar', (gap_indicator, gap_countries), gaps.version,
+                lambda: figures.parity_bar(gap_table, gap_indicator))
+            with stage('plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No selected country is closing this gap at its current trend.")
+
+    # Sortable tables; click a column header to sort
+    number = st.column_config.NumberColumn
+    gap_columns = {
+        'Latest Gap': number(format="%+.1f pp"),
+        'YoY Change': number(format="%+.1f pp"),
+        'Trend (pp/yr)': number(format="%+.2f"),
+        'Closing (pp/yr)': number(format="%+.2f"),
+        'Years to Parity': number(format="%.1f"),
+        'Parity Year': number(format="%d"),
+    }
+
+    st.subheader("📋 Gap Trends by Country")
+    st.dataframe(gap_table.drop(columns='Indicator').sort_values('Latest Gap', key=abs, ascending=False),
+                 column_config=gap_columns, hide_index=True, use_container_width=True)
+
+    st.subheader("🗂️ All Indicators")
+    st.dataframe(gaps.table(countries=gap_countries).sort_values(['Country', 'Indicator']),
+                 column_config=gap_columns, hide_index=True, use_container_width=True)
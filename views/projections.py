@@ -0,0 +1,79 @@
+import streamlit as st
+
+import figures
+from instrument import stage
+from loaders import get_cube, get_export_service, get_figure_cache, get_forecasts, get_view_cache
+from urlstate import Field, ViewState
+from utils import export_buttons
+
+cube = get_cube()
+figure_cache = get_figure_cache()
+view_cache = get_view_cache()
+forecasts = get_forecasts()
+
+# Controls mirrored in the URL
+view_state = ViewState('projections', {
+    'indicator': Field('proj_indicator', cube.indicators),
+    'gender': Field('proj_gender', ['all', 'female', 'male']),
+    'countries': Field('proj_countries', cube.countries, default=cube.countries[:3], multi=True),
+})
+view_state.restore()
+view_key = view_state.sync()
+
+st.title("🔮 Projections")
+st.markdown("Each country's trend extended to the SDG target year, with 95% prediction intervals")
+
+if forecasts is None:
+    # Fitted in the background when a data version loads; usually ready in well under a second
+    st.info("Projections for the latest data are still being computed.")
+    st.button("🔄 Refresh")
+    st.stop()
+if not forecasts.years:
+    # DIWA_FORECAST_YEAR at or before the last observed year
+    st.info(f"The data already reaches {cube.years[-1]}, so there is nothing to project.")
+    st.stop()
+
+target_year = forecasts.years[-1]
+
+# Controls
+col1, col2, col3 = st.columns(3)
+with col1:
+    proj_indicator = st.selectbox("Select Indicator:", cube.indicators, key='proj_indicator')
+with col2:
+    proj_gender = st.selectbox("View by Gender:", ['all', 'female', 'male'], key='proj_gender')
+with col3:
+    proj_countries = st.multiselect("Select Countries:", cube.countries, key='proj_countries')
+
+if proj_countries:
+    trend_data = view_cache.cached(
+        view_key, 'trend_data', cube.version,
+        lambda: cube.frame(countries=proj_countries, indicators=[proj_indicator], genders=[proj_gender]))
+    projection = view_cache.cached(
+        view_key, 'projection', forecasts.version,
+        lambda: forecasts.frame(countries=proj_countries, indicators=[proj_indicator], genders=[proj_gender]))
+
+    def build():
+        fig = figures.comparison_trends(trend_data, proj_indicator)
+        # Overlapping bands are unreadable past a few countries
+        shown = projection if len(proj_countries) <= 3 else projection.drop(columns=['Lower', 'Upper'])
+        return figures.add_projection(fig, trend_data, shown, 'Country')
+
+    fig = figure_cache.cached(
+        'projection_trends', (proj_indicator, proj_gender, proj_countries), forecasts.version, build)
+    with stage('plotly_chart'):
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Target-year table
+    st.subheader(f"🎯 Projected {target_year} Values")
+    target = projection[projection['Year'] == target_year].drop(columns=['Year', 'Indicator', 'Gender'])
+    number = st.column_config.NumberColumn
+    st.dataframe(target.sort_values('Value', ascending=False), hide_index=True, use_container_width=True,
+                 column_config={'Value': number(f"{target_year} (%)", format="%.1f"),
+                                'Lower': number("Lower 95%", format="%.1f"),
+                                'Upper': number("Upper 95%", format="%.1f")})
+
+    export_buttons(get_export_service(), projection, (view_key, forecasts.version),
+                   f'{proj_indicator}_{proj_gender}_projections',
+                   label="📥 Download Projections", widget_key="projection_download")
+else:
+    st.info("Select at least one country to project.")
@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Country,Population[,Year][,Gender][,Sample Size]; rows without Year or
+# Gender apply to every year or gender
+WEIGHTS_PATH = Path(os.environ.get('DIWA_WEIGHTS', 'data/weights.csv'))
+
+COLUMN_ALIASES = {
+    'Country': ['country', 'country name', 'economy'],
+    'Year': ['year', 'time'],
+    'Gender': ['gender', 'sex'],
+    'Population': ['population', 'pop', 'weight'],
+    'Sample Size': ['sample size', 'sample_size', 'n', 'respondents'],
+}
+
+
+class Weights:
+    # Population and optional survey sample size per country x year x
+    # gender, aligned to a cube's axes. NaN where the file has no row.
+
+    def __init__(self, population, samples=None):
+        self.population = population
+        self.samples = samples
+
+
+def _align(frame, column, cube):
+    values = np.full((len(cube.countries), len(cube.years), len(cube.genders)), np.nan)
+    codes = [pd.Categorical(frame[dim], categories=axis).codes
+             for dim, axis in [('Country', cube.countries), ('Year', cube.years), ('Gender', cube.genders)]]
+    known = np.logical_and.reduce([c >= 0 for c in codes])
+    values[tuple(c[known] for c in codes)] = frame[column].to_numpy(dtype=np.float64)[known]
+    return values
+
+
+def load_weights(cube, path=WEIGHTS_PATH):
+    path = Path(path)
+    if not path.exists():
+        return None
+    frame = pd.read_csv(path)
+    lookup = {alias: name for name, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    frame = frame.rename(columns={col: lookup[col.strip().lower()] for col in frame.columns
+                                  if col.strip().lower() in lookup})
+    missing = [col for col in ['Country', 'Population'] if col not in frame.columns]
+    if missing:
+        raise ValueError(f"{path}: missing required columns: {', '.join(missing)}")
+
+    frame['Country'] = frame['Country'].astype(str).str.strip()
+    if 'Year' not in frame.columns:
+        frame = frame.merge(pd.DataFrame({'Year': cube.years}), how='cross')
+    if 'Gender' not in frame.columns:
+        frame = frame.merge(pd.DataFrame({'Gender': cube.genders}), how='cross')
+    frame['Gender'] = frame['Gender'].astype(str).str.strip().str.lower()
+    frame['Year'] = pd.to_numeric(frame['Year'], errors='coerce')
+
+    samples = _align(frame, 'Sample Size', cube) if 'Sample Size' in frame.columns else None
+    return Weights(_align(frame, 'Population', cube), samples)